@@ -0,0 +1,222 @@
+"""
+Admission control for the Flask endpoints.
+
+Every limited endpoint has its own gate: a fixed number of concurrent
+requests plus a bounded wait queue. CPU-heavy endpoints also share the
+"analysis" gate, where interactive calls are served before bulk ones and one
+slot is kept for interactive calls only, so bulk work (e.g. a long export
+stream) can never lock them out. A request that finds the queue full, or
+waits too long, gets a 429 with a Retry-After header instead of piling up
+until everything times out.
+
+Each admitted request also gets a deadline: the endpoint default, shortened
+by an `X-Request-Timeout: <seconds>` header when the client will give up
+sooner. Long-running loops call `check_deadline()` and abort with a 503 once
+it has passed.
+
+Limits can be overridden per gate with ADMISSION_<NAME>=<concurrency>:<queue>,
+e.g. ADMISSION_UPLOAD_CVS=4:16.
+"""
+
+import functools
+import heapq
+import itertools
+import math
+import os
+import threading
+import time
+
+from flask import current_app, g, jsonify, request
+
+INTERACTIVE = 0
+BULK = 1
+
+# name -> (max concurrent, max queued, seconds a request may wait in the queue)
+DEFAULT_LIMITS = {
+    "analysis": (max(2, os.cpu_count() or 2), 64, 30),
+    "upload_tender": (2, 8, 15),
+    "upload_cvs": (2, 4, 15),
+    "intelligence_analyze": (2, 8, 15),
+    "intelligence_team": (2, 8, 15),
+    "smarttender_analyze": (4, 16, 10),
+    "smarttender_export": (1, 2, 5),
+    "tenders": (4, 16, 10),
+    "send_validation_mail": (4, 32, 5),
+    "snapshot": (1, 2, 5),
+}
+
+# name -> slots only INTERACTIVE requests may take
+INTERACTIVE_RESERVE = {
+    "analysis": 1,
+}
+
+
+class Saturated(Exception):
+    def __init__(self, gate, retry_after):
+        super().__init__(f"{gate} is saturated")
+        self.gate = gate
+        self.retry_after = retry_after
+
+
+class DeadlineExceeded(Exception):
+    pass
+
+
+class Gate:
+    """Counting semaphore with a bounded, priority-ordered wait queue."""
+
+    def __init__(self, name, max_concurrent, max_queue, queue_timeout, interactive_reserve=0):
+        self.name = name
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        # Bulk requests may hold at most this many slots (never fewer than one)
+        self.max_bulk = max(1, max_concurrent - interactive_reserve)
+        self._cond = threading.Condition()
+        self._active = 0
+        self._bulk_active = 0
+        self._waiters = []  # heap of [priority, seq]
+        self._seq = itertools.count()
+        # Moving average of how long a request holds the gate, for Retry-After.
+        self._avg_hold = 1.0
+
+    def retry_after(self):
+        backlog = len(self._waiters) + 1
+        return max(1, math.ceil(self._avg_hold * backlog / max(1, self.max_concurrent)))
+
+    def _admissible(self, priority):
+        if self._active >= self.max_concurrent:
+            return False
+        return priority == INTERACTIVE or self._bulk_active < self.max_bulk
+
+    def _admit(self, priority):
+        self._active += 1
+        if priority != INTERACTIVE:
+            self._bulk_active += 1
+
+    def acquire(self, priority=BULK, timeout=None):
+        """Take a slot, waiting in the queue if needed. Raises Saturated."""
+        timeout = self.queue_timeout if timeout is None else min(timeout, self.queue_timeout)
+        with self._cond:
+            if self._admissible(priority) and not self._waiters:
+                self._admit(priority)
+                return
+            if len(self._waiters) >= self.max_queue or timeout <= 0:
+                raise Saturated(self.name, self.retry_after())
+
+            entry = [priority, next(self._seq)]
+            heapq.heappush(self._waiters, entry)
+            give_up_at = time.monotonic() + timeout
+            while True:
+                if self._waiters[0] is entry and self._admissible(priority):
+                    heapq.heappop(self._waiters)
+                    self._admit(priority)
+                    # The next waiter may be able to go too.
+                    self._cond.notify_all()
+                    return
+                remaining = give_up_at - time.monotonic()
+                if remaining <= 0:
+                    self._waiters.remove(entry)
+                    heapq.heapify(self._waiters)
+                    self._cond.notify_all()
+                    raise Saturated(self.name, self.retry_after())
+                self._cond.wait(remaining)
+
+    def release(self, held_for=None, priority=BULK):
+        with self._cond:
+            self._active -= 1
+            if priority != INTERACTIVE:
+                self._bulk_active -= 1
+            if held_for is not None:
+                self._avg_hold = 0.8 * self._avg_hold + 0.2 * held_for
+            self._cond.notify_all()
+
+
+def _load_limits():
+    limits = dict(DEFAULT_LIMITS)
+    for name, (concurrency, queue, queue_timeout) in DEFAULT_LIMITS.items():
+        override = os.environ.get(f"ADMISSION_{name.upper()}")
+        if override:
+            concurrency, _, queue = override.partition(":")
+            limits[name] = (int(concurrency), int(queue or 0), queue_timeout)
+    return limits
+
+
+GATES = {name: Gate(name, *limit, interactive_reserve=INTERACTIVE_RESERVE.get(name, 0))
+         for name, limit in _load_limits().items()}
+
+
+# --- per-request deadline -----------------------------------------------------
+
+def start_deadline(seconds):
+    header = request.headers.get("X-Request-Timeout")
+    if header:
+        try:
+            seconds = min(seconds, float(header))
+        except ValueError:
+            pass
+    g.admission_deadline = time.monotonic() + seconds
+
+
+def remaining_time():
+    deadline = g.get("admission_deadline")
+    return None if deadline is None else deadline - time.monotonic()
+
+
+def check_deadline():
+    """Abort the current request if its deadline has passed."""
+    remaining = remaining_time()
+    if remaining is not None and remaining <= 0:
+        raise DeadlineExceeded()
+
+
+# --- Flask integration --------------------------------------------------------
+
+def limit(name, priority=BULK, deadline=60, shared=True):
+    """
+    Decorator for a Flask view: admit through the `name` gate (and the shared
+    "analysis" gate when `shared`), then run under a `deadline` in seconds.
+    Streamed responses keep their slots until the stream is closed.
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            start_deadline(deadline)
+            gates = [GATES[name]] + ([GATES["analysis"]] if shared else [])
+            acquired = []
+            try:
+                for gate in gates:
+                    gate.acquire(priority, timeout=remaining_time())
+                    acquired.append(gate)
+            except Saturated as e:
+                for gate in acquired:
+                    gate.release(priority=priority)
+                response = jsonify({"error": "Server busy, please retry later"})
+                response.status_code = 429
+                response.headers["Retry-After"] = str(e.retry_after)
+                return response
+
+            admitted_at = time.monotonic()
+
+            def release_all():
+                held_for = time.monotonic() - admitted_at
+                for gate in acquired:
+                    gate.release(held_for, priority)
+
+            try:
+                response = view(*args, **kwargs)
+            except DeadlineExceeded:
+                release_all()
+                return jsonify({"error": "Request deadline exceeded"}), 503
+            except BaseException:
+                release_all()
+                raise
+
+            response = current_app.make_response(response)
+            if response.is_streamed:
+                response.call_on_close(release_all)
+            else:
+                release_all()
+            return response
+        return wrapper
+    return decorator
@@ -1,23 +1,40 @@
 
 import os
+import io
 import json
+import functools
+import math
 import re
-from flask import Flask, request, jsonify
+import uuid
+from flask import Flask, Response, request, jsonify, stream_with_context
 from flask_cors import CORS
 from werkzeug.utils import secure_filename
-import PyPDF2
-import docx
+import admission
+import candidate_pool
+import cv_dedup
+import document_extraction
+import export_stream
 import llm_service
+import parse_budget
+import pipeline
+import profile_store
+import request_profiler
 import smarttender_service
-import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
+import snapshot
+import team_builder
+import tender_index
 
 app = Flask(__name__)
 CORS(app)
 
 # Simple mail sender (for demo; replace with real SMTP config)
 def send_validation_mail(to_email, status, reason):
+    # Mail support is imported on first use to keep app start-up fast
+    import smtplib
+    from email.mime.text import MIMEText
+    from email.mime.multipart import MIMEMultipart
+
+    llm_service.load_env()
     sender_email = os.environ.get('MAIL_SENDER', 'noreply@smarttender.local')
     smtp_server = os.environ.get('SMTP_SERVER', 'localhost')
     smtp_port = int(os.environ.get('SMTP_PORT', 1025))
@@ -37,6 +54,7 @@ def send_validation_mail(to_email, status, reason):
         return False
 
 @app.route('/api/send-validation-mail', methods=['POST'])
+@admission.limit('send_validation_mail', priority=admission.INTERACTIVE, deadline=30, shared=False)
 def send_validation_mail_api():
     data = request.get_json()
     email = data.get('email')
@@ -54,35 +72,42 @@ def send_validation_mail_api():
 stored_data = {
     "tender_text": "",
     "tender_requirements": None,  # Store extracted requirements once
-    "cv_texts": [] # list of dicts: {"filename": "", "text": ""}
+    "cv_profiles": candidate_pool.CandidatePool(), # deduplicated, ranked profile_store.CompactProfiles (raw CV text is not kept)
+    "open_tenders": tender_index.TenderIndex() # requirements of open tenders, for reverse matching
 }
 
+def profiling_context():
+    """Stored documents as seen by a profiled request (hashes only)."""
+    return {
+        "tender": request_profiler.content_hash(stored_data["tender_text"]),
+        "cv_count": len(stored_data["cv_profiles"])
+    }
+
+# No-op unless PROFILE_DIR is set
+request_profiler.init_app(app, context=profiling_context)
+
 def extract_text_from_file(file):
     filename = secure_filename(file.filename)
-    ext = filename.rsplit('.', 1)[1].lower() if '.' in filename else ''
-    text = ""
-    
-    try:
-        if ext == 'pdf':
-            reader = PyPDF2.PdfReader(file)
-            for page in reader.pages:
-                text += page.extract_text() + "\n"
-        elif ext in ['doc', 'docx']:
-            doc = docx.Document(file)
-            for para in doc.paragraphs:
-                text += para.text + "\n"
-        else:
-            text = file.read().decode('utf-8', errors='ignore')
-    except Exception as e:
-        print(f"Error extracting text from {filename}: {e}")
-        text = ""
-        
-    return text
+    return document_extraction.extract_text(file, filename)
+
+# Fallback parser patterns; written to run in linear time on any input (see parse_budget)
+_FIELD_BODY = re.compile(r'[\s:]+(.*?)(?=\n[A-Z]|$)', re.IGNORECASE | re.DOTALL)
+_SECTION_BODY = re.compile(r'[\s:]*(.*?)(?=\n\s*\n|\n[A-Z][a-z]+:|$)', re.IGNORECASE | re.DOTALL)
+_YEARS = re.compile(r'(?<!\d)(\d+)\+?\s*years?', re.IGNORECASE)
+_YEARS_OF_EXPERIENCE = re.compile(r'(?<!\d)(\d+)\+?\s*years?(?:\s+of)?\s+experience', re.IGNORECASE)
+
+def parse_tender_requirements(text, budget=None):
+    if budget is None:
+        budget = parse_budget.ParseBudget()
+    text = budget.clip(text)
+    lines = text.split('\n')
+    lowered_lines = [line.lower() for line in lines]
 
-def parse_tender_requirements(text):
     def extract_field(label, text):
         # Look for Label followed by colon or newline, capturing up to the next newline or common delimiter
-        match = re.search(rf'{label}[\s:]+(.*?)(?=\n[A-Z]|$)', text, re.IGNORECASE | re.DOTALL)
+        if budget.expired():
+            return ""
+        match = parse_budget.match_after_label(parse_budget.label_pattern(label), _FIELD_BODY, text)
         if match:
             return match.group(1).replace('\n', ' ').strip()
         return ""
@@ -91,11 +116,9 @@ def parse_tender_requirements(text):
         val = extract_field(label, text)
         if not val:
             # fallback: look for a block that might look like a list
-            match = re.search(rf'{label}.*?\n((?:[ \t]*[-*•].*?\n)+)', text, re.IGNORECASE)
-            if match:
-                items = re.findall(r'[-*•]\s*(.*)', match.group(1))
-                return [i.strip() for i in items if i.strip()]
-            return []
+            if budget.expired():
+                return []
+            return [i for i in parse_budget.bullet_block(lines, lowered_lines, label) if i]
         
         # Split by comma or bullet points if present
         if ',' in val:
@@ -108,7 +131,7 @@ def parse_tender_requirements(text):
     exp_text = extract_field("Experience", text)
     if not exp_text:
         # Fallback to looking for "X years experience"
-         exp_match = re.search(r'(\d+)\+?\s*years?', text, re.IGNORECASE)
+         exp_match = _YEARS.search(text) if not budget.expired() else None
          exp_years = exp_match.group(1) if exp_match else "Not specified"
     else:
          exp_years_match = re.search(r'\d+', exp_text)
@@ -123,11 +146,17 @@ def parse_tender_requirements(text):
         "constraints": extract_list("Constraints", text)
     }
 
-def parse_candidate_profile(text, filename):
+def parse_candidate_profile(text, filename, budget=None):
+    if budget is None:
+        budget = parse_budget.ParseBudget()
+    text = budget.clip(text)
+
     def extract_section(labels):
         # looks for any of the labels, captures text up to next double newline or strong header
+        if budget.expired():
+            return ""
         for label in labels:
-            match = re.search(rf'{label}s?[\s:]*\n*(.*?)(?=\n\s*\n|\n[A-Z][a-z]+:|$)', text, re.IGNORECASE | re.DOTALL)
+            match = parse_budget.match_after_label(parse_budget.label_pattern(label, 's?'), _SECTION_BODY, text)
             if match:
                 cleaned = match.group(1).replace('\n', ', ')
                 return cleaned.strip()
@@ -142,7 +171,7 @@ def parse_candidate_profile(text, filename):
         name = filename.split('.')[0]
     
     # Experience
-    exp_match = re.search(r'(\d+)\+?\s*years?(?:\s+of)?\s+experience', text, re.IGNORECASE)
+    exp_match = _YEARS_OF_EXPERIENCE.search(text) if not budget.expired() else None
     experience_years = exp_match.group(1) if exp_match else "Not specified"
     
     skills_str = extract_section(['Skills', 'Core Competencies', 'Technical Skills', 'Expertise'])
@@ -230,8 +259,75 @@ def generate_bid_draft(tender, profile, explanation):
         
     return draft.strip()
 
+def parse_upload(upload):
+    """
+    Parse stage for one uploaded CV, (filename, file bytes) -> plain parsed
+    data. Runs in pipeline workers; CompactProfiles are built by the caller.
+    """
+    filename, data = upload
+    text = document_extraction.extract_text(io.BytesIO(data), filename)
+    # Both parsers share one budget, so a hostile CV costs at most one time budget.
+    budget = parse_budget.ParseBudget()
+    return (
+        filename,
+        parse_candidate_profile(text, filename, budget),
+        smarttender_service.extract_cv_data(text, filename, budget)["candidate"],
+        cv_dedup.signature(budget.clip(text)),
+        budget.exceeded
+    )
+
+def _crashed_upload(upload):
+    """parse_upload's result for a file whose parsing killed its worker process."""
+    print(f"Parsing {upload[0]} crashed a pipeline worker; file skipped")
+    return upload[0], None, None, None, False
+
+def match_profile(tender_reqs, profile):
+    """Match stage for one profile dict: (explanation, bid draft, score). Runs in pipeline workers."""
+    explanation = generate_matching_explanation(tender_reqs, profile)
+    
+    num_req_skills = len(tender_reqs['skills'])
+    matched = len(explanation['matched_skills'])
+    score = int(round((matched / num_req_skills) * 100)) if num_req_skills > 0 else 0
+    
+    return explanation, generate_bid_draft(tender_reqs, profile, explanation), score
+
+def _candidate_result(profile, match):
+    explanation, bid_draft, score = match
+    return {
+        "profile": profile,
+        "matchingInfo": {"matching_explanation": explanation},
+        "bidDraft": bid_draft,
+        "score": score
+    }
+
+def score_candidate(tender_reqs, cv_profile):
+    """Rule-based match of one stored CV against the tender (no AI)."""
+    profile = cv_profile.profile_dict()
+    return _candidate_result(profile, match_profile(tender_reqs, profile))
+
+def score_candidates(tender_reqs, cv_profiles):
+    """score_candidate for many CVs, with the match stage spread over the pipeline workers."""
+    profiles = [cv_profile.profile_dict() for cv_profile in cv_profiles]
+    matches = pipeline.map_ordered(functools.partial(match_profile, tender_reqs), profiles)
+    return [_candidate_result(profile, match) for profile, match in zip(profiles, matches)]
+
+def _scorers(tender_reqs):
+    if tender_reqs is None:
+        return {"scorer": None, "batch_scorer": None}
+    return {
+        "scorer": functools.partial(score_candidate, tender_reqs),
+        "batch_scorer": functools.partial(score_candidates, tender_reqs)
+    }
+
+def set_tender_requirements(tender_reqs):
+    """Store new tender requirements and re-rank every stored CV against them."""
+    stored_data["tender_requirements"] = tender_reqs
+    if tender_reqs is not None:
+        stored_data["cv_profiles"].rescore(**_scorers(tender_reqs))
+
 
 @app.route('/api/upload-tender', methods=['POST'])
+@admission.limit('upload_tender', priority=admission.INTERACTIVE, deadline=120)
 def upload_tender():
     if 'file' not in request.files:
         return jsonify({"error": "No file provided"}), 400
@@ -241,13 +337,14 @@ def upload_tender():
         return jsonify({"error": "Empty filename"}), 400
         
     text = extract_text_from_file(file)
+    admission.check_deadline()
     stored_data["tender_text"] = text
     
     # Extract tender requirements using Groq AI once
     try:
         if llm_service.is_llm_configured():
             print("Extracting tender requirements with Groq AI...")
-            stored_data["tender_requirements"] = llm_service.extract_tender_requirements(text)
+            set_tender_requirements(llm_service.extract_tender_requirements(text))
             return jsonify({
                 "message": "Tender uploaded and analyzed successfully", 
                 "text_length": len(text),
@@ -258,100 +355,206 @@ def upload_tender():
         stored_data["tender_requirements"] = None  # Will use regex fallback
     
     # Fallback: use regex-based extraction
-    stored_data["tender_requirements"] = parse_tender_requirements(text)
+    budget = parse_budget.ParseBudget()
+    set_tender_requirements(parse_tender_requirements(text, budget))
     return jsonify({
         "message": "Tender uploaded successfully (using fallback extraction)", 
         "text_length": len(text),
-        "ai_used": False
+        "ai_used": False,
+        "partial_parse": budget.exceeded,
+        "parse_warnings": budget.warnings("Tender")
     })
 
 
 @app.route('/api/upload-cvs', methods=['POST'])
+@admission.limit('upload_cvs', priority=admission.BULK, deadline=300)
 def upload_cvs():
     if 'files' not in request.files:
         return jsonify({"error": "No files provided"}), 400
+    
+    # "replace" (default) swaps in the new batch; "append" adds it to the stored CVs
+    mode = request.form.get('mode', 'replace')
+    if mode not in ('replace', 'append'):
+        return jsonify({"error": "mode must be 'replace' or 'append'"}), 400
         
     files = request.files.getlist('files')
-    stored_data["cv_texts"] = []
-    
-    for file in files:
-        if file.filename == '':
+    # Read lazily: the pipeline only holds a bounded window of files in memory
+    uploads = ((secure_filename(file.filename), file.read()) for file in files if file.filename != '')
+    
+    # Parse once at upload time, across the pipeline workers (results keep the
+    # upload order); only the compact parsed form is stored.
+    uploaded = []
+    failed = []
+    for filename, profile, candidate, signature, partial_parse in pipeline.map_ordered(
+            parse_upload, uploads, check=admission.check_deadline, on_crash=_crashed_upload):
+        if profile is None:
+            failed.append(filename)
             continue
-        text = extract_text_from_file(file)
-        stored_data["cv_texts"].append({
-            "filename": secure_filename(file.filename),
-            "text": text
-        })
+        uploaded.append(profile_store.CompactProfile.from_parsed(
+            filename, profile, candidate, signature=signature, partial_parse=partial_parse
+        ))
+    
+    # Only touch the stored CVs once the whole batch has been extracted. New CVs
+    # are deduplicated against everything uploaded so far (the last uploaded
+    # version represents its cluster) and scored against the current tender.
+    cv_profiles = stored_data["cv_profiles"]
+    cv_profiles.add(uploaded, replace=(mode == 'replace'))
         
-    return jsonify({"message": f"{len(stored_data['cv_texts'])} CVs uploaded successfully"})
+    return jsonify({
+        "message": f"{len(uploaded)} CVs uploaded successfully",
+        "mode": mode,
+        "unique_candidates": len(cv_profiles),
+        "duplicates_removed": cv_profiles.uploaded() - len(cv_profiles),
+        "partially_parsed": [p.filename for p in uploaded if p.partial_parse],
+        "failed": failed
+    })
 
 
 @app.route('/api/intelligence/analyze', methods=['GET'])
+@admission.limit('intelligence_analyze', priority=admission.BULK, deadline=120)
 def get_analysis():
     if not stored_data["tender_text"]:
         return jsonify({"error": "No tender document uploaded"}), 400
         
-    if not stored_data["cv_texts"]:
+    if not stored_data["cv_profiles"]:
         return jsonify({"error": "No CV documents uploaded"}), 400
     
     # Use previously extracted tender requirements (from upload step)
     tender_reqs = stored_data["tender_requirements"]
+    ai_extraction_used = tender_reqs is not None
     
     # If somehow extraction wasn't done, fall back to regex
     if not tender_reqs:
         print("Tender requirements missing. Using regex fallback.")
-        tender_reqs = parse_tender_requirements(stored_data["tender_text"])
+        set_tender_requirements(parse_tender_requirements(stored_data["tender_text"]))
+        tender_reqs = stored_data["tender_requirements"]
+    
+    # CVs were scored (rule-based, no AI per candidate) when uploaded or when
+    # the tender changed; only the maintained ranking is read here.
+    # ?limit=k returns the top k only.
+    cv_profiles = stored_data["cv_profiles"]
+    limit = request.args.get('limit', type=int)
+    ranked = cv_profiles.ranked(limit if limit and limit > 0 else None)
     
-    # Rule-based matching for ALL CVs (no AI per candidate)
     results = []
-    for idx, cv_data in enumerate(stored_data["cv_texts"]):
-        profile = parse_candidate_profile(cv_data["text"], cv_data["filename"])
-        explanation = generate_matching_explanation(tender_reqs, profile)
-        
-        num_req_skills = len(tender_reqs['skills'])
-        matched = len(explanation['matched_skills'])
-        score = int(round((matched / num_req_skills) * 100)) if num_req_skills > 0 else 0
-        
+    for serial, cv_profile, result in ranked:
         results.append({
-            "id": idx + 1,
-            "profile": profile,
-            "matchingInfo": {"matching_explanation": explanation},
-            "bidDraft": generate_bid_draft(tender_reqs, profile, explanation),
-            "score": score,
+            "id": serial,
+            **result,
+            "duplicates": list(cv_profile.duplicates),
+            "partial_parse": cv_profile.partial_parse,
             "justification_paragraph": ""  # Will be filled for top match only
         })
     
-    # Sort by score descending
-    results.sort(key=lambda x: x['score'], reverse=True)
-    
-    # Generate AI justification ONLY for the top-matched candidate
-    if results and llm_service.is_llm_configured():
-        top_candidate = results[0]
-        try:
-            print("Generating AI justification for top-matched candidate...")
-            justification = llm_service.generate_justification_paragraph(
-                tender_reqs,
-                top_candidate["profile"],
-                top_candidate["matchingInfo"]["matching_explanation"]
-            )
+    # Generate AI justification ONLY for the top-matched candidate, once per tender
+    ai_used = llm_service.is_llm_configured()
+    if results and ai_used:
+        top_serial = ranked[0][0]
+        justification = cv_profiles.justification(top_serial)
+        if justification is None:
+            top_candidate = results[0]
+            try:
+                print("Generating AI justification for top-matched candidate...")
+                justification = llm_service.generate_justification_paragraph(
+                    tender_reqs,
+                    top_candidate["profile"],
+                    top_candidate["matchingInfo"]["matching_explanation"]
+                )
+                cv_profiles.set_justification(top_serial, justification)
+            except Exception as e:
+                print(f"AI justification failed: {e}. Using fallback.")
+                ai_used = False
+        if justification is not None:
             results[0]["justification_paragraph"] = justification
-            ai_used = True
-        except Exception as e:
-            print(f"AI justification failed: {e}. Using fallback.")
-            ai_used = False
-    else:
-        ai_used = llm_service.is_llm_configured()
     
     return jsonify({
         "tender_requirements": tender_reqs,
         "candidates": results,
-        "total_candidates": len(results),
-        "ai_extraction_used": stored_data["tender_requirements"] is not None,
+        "total_candidates": len(cv_profiles),
+        "duplicate_clusters": [
+            {"representative": p.filename, "members": [p.filename, *p.duplicates]}
+            for p in cv_profiles if p.duplicates
+        ],
+        "ai_extraction_used": ai_extraction_used,
         "ai_justification_used": ai_used
     })
 
 
+@app.route('/api/intelligence/team', methods=['POST'])
+@admission.limit('intelligence_team', priority=admission.BULK, deadline=60)
+def build_team():
+    """
+    Smallest (or cheapest) teams of uploaded consultants covering every
+    required skill and certification of the tender.
+    
+    REQUEST JSON (all optional):
+    {
+      "max_teams": 5,
+      "time_limit": 2.0,
+      "costs": {"3": 650}
+    }
+    
+    Consultants are identified by their candidate "id" (as in
+    /api/intelligence/analyze); members also carry "name" and "filename".
+    With "costs" (keyed by id), teams minimize total cost and consultants
+    without a cost are left out; otherwise they minimize team size.
+    """
+    if not stored_data["tender_text"]:
+        return jsonify({"error": "No tender document uploaded"}), 400
+        
+    if not stored_data["cv_profiles"]:
+        return jsonify({"error": "No CV documents uploaded"}), 400
+    
+    data = request.get_json(silent=True) or {}
+    try:
+        max_teams = max(1, min(int(data.get("max_teams", team_builder.DEFAULT_MAX_TEAMS)), 20))
+        time_limit = float(data.get("time_limit", team_builder.DEFAULT_TIME_LIMIT))
+        costs = {int(serial): float(cost) for serial, cost in (data.get("costs") or {}).items()}
+    except (TypeError, ValueError, AttributeError):
+        return jsonify({"error": "Invalid max_teams, time_limit or costs"}), 400
+    # NaN would make the search deadline never expire
+    if not math.isfinite(time_limit) or time_limit <= 0:
+        return jsonify({"error": "time_limit must be a positive number of seconds"}), 400
+    if not all(math.isfinite(cost) and cost >= 0 for cost in costs.values()):
+        return jsonify({"error": "Costs must be finite and not negative"}), 400
+    
+    # Leave room to serialize the answer before the request deadline
+    remaining = admission.remaining_time()
+    if remaining is not None:
+        time_limit = min(time_limit, max(0.0, remaining - 1.0))
+    
+    tender_reqs = stored_data["tender_requirements"] or parse_tender_requirements(stored_data["tender_text"])
+    requirements = [("skill", s) for s in tender_reqs["skills"]] + \
+                   [("certification", c) for c in tender_reqs.get("certifications", [])]
+    
+    consultants = []
+    cv_profiles = dict(stored_data["cv_profiles"].items())
+    for serial, cv_profile in cv_profiles.items():
+        if costs and serial not in costs:
+            continue
+        profile = cv_profile.profile_dict()
+        consultants.append({
+            "id": serial,
+            "skill": profile["skills"],
+            "certification": profile["certifications"],
+            "cost": costs.get(serial)
+        })
+    
+    result = team_builder.build_teams(requirements, consultants, max_teams=max_teams, time_limit=time_limit)
+    for team in result["teams"]:
+        for member in team["members"]:
+            member["name"] = cv_profiles[member["id"]].name
+            member["filename"] = cv_profiles[member["id"]].filename
+    
+    return jsonify({
+        "tender_requirements": tender_reqs,
+        "objective": "cost" if costs else "size",
+        **result
+    })
+
+
 @app.route('/api/smarttender/analyze', methods=['POST'])
+@admission.limit('smarttender_analyze', priority=admission.INTERACTIVE, deadline=30)
 def smarttender_analyze():
     """
     SmartTender AI: Enterprise-grade tender response optimization.
@@ -383,6 +586,8 @@ def smarttender_analyze():
             "error": "Tender text and CV text cannot be empty"
         }), 400
     
+    admission.check_deadline()
+    
     # Run full 6-step analysis
     analysis_result = smarttender_service.run_full_analysis(
         tender_text=tender_text,
@@ -398,5 +603,181 @@ def smarttender_analyze():
     return jsonify(analysis_result["analysis"]), 200
 
 
+@app.route('/api/smarttender/export', methods=['GET'])
+@admission.limit('smarttender_export', priority=admission.BULK, deadline=900)
+def smarttender_export():
+    """
+    Stream the SmartTender analysis of every uploaded CV as CSV or XLSX.
+    
+    QUERY: ?format=csv (default) or ?format=xlsx
+    
+    RESPONSE: One row per CV (export_summary + validation paragraph + rejection email),
+    produced one CV at a time so memory stays constant whatever the shortlist size.
+    """
+    
+    fmt = request.args.get('format', 'csv').lower()
+    if fmt not in export_stream.WRITERS:
+        return jsonify({"error": f"Unsupported export format: {fmt}"}), 400
+    
+    if not stored_data["tender_text"]:
+        return jsonify({"error": "No tender document uploaded"}), 400
+    
+    if not stored_data["cv_profiles"]:
+        return jsonify({"error": "No CV documents uploaded"}), 400
+    
+    tender_text = stored_data["tender_text"]
+    cv_profiles = list(stored_data["cv_profiles"])
+    
+    def rows():
+        candidates = ((p.filename, p.candidate_dict()) for p in cv_profiles)
+        analyses = smarttender_service.iter_batch_analysis(tender_text, candidates)
+        for cv_profile, (cv_filename, result) in zip(cv_profiles, analyses):
+            # Past the deadline the client has given up: abort the stream
+            admission.check_deadline()
+            row = {"cv_file": cv_filename, "duplicates": "; ".join(cv_profile.duplicates)}
+            if result["status"] == "success":
+                row.update(export_stream.summary_row(result["analysis"]))
+            else:
+                row["error"] = result["error"]
+            yield row
+    
+    columns = ["cv_file", "duplicates"] + export_stream.EXPORT_COLUMNS + ["error"]
+    body = export_stream.WRITERS[fmt](rows(), columns)
+    return Response(
+        stream_with_context(body),
+        content_type=export_stream.CONTENT_TYPES[fmt],
+        headers={"Content-Disposition": f"attachment; filename=smarttender_export.{fmt}"}
+    )
+
+
+def _document_text_from_request(text_field):
+    """Text of an uploaded 'file', or of `text_field` in the JSON body. Returns (text, filename)."""
+    if 'file' in request.files and request.files['file'].filename:
+        file = request.files['file']
+        return extract_text_from_file(file), secure_filename(file.filename)
+    data = request.get_json(silent=True) or {}
+    return (data.get(text_field) or '').strip(), data.get('filename', '')
+
+
+@app.route('/api/tenders', methods=['GET'])
+def list_open_tenders():
+    tenders = stored_data["open_tenders"].tenders()
+    return jsonify({"tenders": tenders, "total_tenders": len(tenders)})
+
+
+@app.route('/api/tenders', methods=['POST'])
+@admission.limit('tenders', priority=admission.INTERACTIVE, deadline=60)
+def add_open_tender():
+    """
+    Register an open tender for reverse matching.
+    
+    REQUEST: multipart 'file' (+ optional form 'tender_id'), or JSON
+    {"tender_text": "...", "tender_id": "optional", "title": "optional"}
+    """
+    
+    text, filename = _document_text_from_request('tender_text')
+    if not text:
+        return jsonify({"error": "Missing tender document or tender_text"}), 400
+    
+    data = request.get_json(silent=True) or {}
+    tender_id = request.form.get('tender_id') or data.get('tender_id') or filename.rsplit('.', 1)[0] or uuid.uuid4().hex[:12]
+    title = request.form.get('title') or data.get('title') or filename or tender_id
+    
+    tender = smarttender_service.extract_tender_requirements(text)["tender"]
+    stored_data["open_tenders"].add(tender_id, tender, title)
+    return jsonify({"tender_id": tender_id, "title": title, "tender": tender}), 201
+
+
+@app.route('/api/tenders/<tender_id>', methods=['DELETE'])
+def close_open_tender(tender_id):
+    if not stored_data["open_tenders"].remove(tender_id):
+        return jsonify({"error": "Unknown tender"}), 404
+    return jsonify({"message": f"Tender {tender_id} closed"})
+
+
+@app.route('/api/tenders/match', methods=['POST'])
+@admission.limit('tenders', priority=admission.INTERACTIVE, deadline=30)
+def match_open_tenders():
+    """
+    Reverse matching: rank the open tenders one CV is eligible for.
+    
+    REQUEST: multipart 'file', or JSON {"cv_text": "..."}; optional ?limit=20 (>= 1)
+    """
+    
+    limit = request.args.get('limit', default=20, type=int)
+    if limit < 1:
+        return jsonify({"error": "limit must be a positive integer"}), 400
+    
+    text, filename = _document_text_from_request('cv_text')
+    if not text:
+        return jsonify({"error": "Missing CV document or cv_text"}), 400
+    
+    candidate = smarttender_service.extract_cv_data(text, filename or "CV")["candidate"]
+    matches = stored_data["open_tenders"].match(candidate, limit=limit)
+    return jsonify({
+        "candidate": candidate,
+        "matches": matches,
+        "total_matches": len(matches),
+        "open_tenders": len(stored_data["open_tenders"])
+    })
+
+
+# --- Snapshot / warm start -----------------------------------------------------
+
+SNAPSHOT_PATH = os.environ.get("SMARTTENDER_SNAPSHOT")
+
+def save_snapshot(path):
+    return snapshot.save(
+        path,
+        stored_data["cv_profiles"],
+        tender_text=stored_data["tender_text"],
+        tender_requirements=stored_data["tender_requirements"],
+        open_tenders=stored_data["open_tenders"].tenders()
+    )
+
+def load_snapshot(path):
+    """Replace the stored documents with a snapshot's (no re-parsing, no re-scoring)."""
+    snap = snapshot.load(path)
+    tender_reqs = snap.tender_requirements
+    stored_data["cv_profiles"].restore(**_scorers(tender_reqs), **snap.pool_state)
+    stored_data["tender_text"] = snap.tender_text
+    stored_data["tender_requirements"] = tender_reqs
+    
+    open_tenders = tender_index.TenderIndex()
+    for entry in snap.open_tenders:
+        entry = dict(entry)
+        tender_id, title = entry.pop("tender_id"), entry.pop("title")
+        open_tenders.add(tender_id, entry, title)
+    stored_data["open_tenders"] = open_tenders
+    return snap
+
+
+@app.route('/api/snapshot', methods=['POST'])
+@admission.limit('snapshot', priority=admission.BULK, deadline=120, shared=False)
+def write_snapshot():
+    """Save the parsed bench to SMARTTENDER_SNAPSHOT for the next warm start."""
+    if not SNAPSHOT_PATH:
+        return jsonify({"error": "Snapshots are disabled (set SMARTTENDER_SNAPSHOT)"}), 400
+    try:
+        info = save_snapshot(SNAPSHOT_PATH)
+    except OSError as e:
+        print(f"Snapshot failed: {e}")
+        return jsonify({"error": "Failed to write snapshot"}), 500
+    return jsonify({"message": "Snapshot saved", **info})
+
+
+# Warm start: every worker maps the same snapshot file (pipeline workers only
+# need this module's functions, not the stored documents)
+if SNAPSHOT_PATH and os.path.exists(SNAPSHOT_PATH) and not pipeline.in_worker():
+    try:
+        load_snapshot(SNAPSHOT_PATH)
+        print(f"Loaded snapshot {SNAPSHOT_PATH}: {len(stored_data['cv_profiles'])} candidates")
+    except (OSError, ValueError, TypeError, KeyError, IndexError, snapshot.SnapshotError) as e:
+        # Start empty rather than half-restored
+        stored_data.update(tender_text="", tender_requirements=None,
+                           cv_profiles=candidate_pool.CandidatePool(), open_tenders=tender_index.TenderIndex())
+        print(f"Ignoring snapshot {SNAPSHOT_PATH}: {e}")
+
+
 if __name__ == '__main__':
     app.run(debug=True, port=5000)
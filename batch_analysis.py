@@ -0,0 +1,235 @@
+"""
+Offline batch runner for SmartTender analysis.
+
+Runs smarttender_service.run_full_analysis for every (tender, CV) pair found
+in the given files, directories or glob patterns, using a process pool.
+Results are streamed to a JSONL or CSV file as they complete, and every
+finished pair is recorded in a checkpoint file so an interrupted run resumes
+where it stopped.
+
+Each CV is extracted once and analyzed against all of its pending tenders;
+tenders are extracted and parsed once per worker process. A document that
+cannot be read or extracted produces error rows instead of stopping the run.
+
+Usage:
+    python batch_analysis.py --tenders tenders/ --cvs "cvs/**/*.pdf" --output results.jsonl
+    python batch_analysis.py --tenders t.docx --cvs cvs/ --output results.csv --workers 8
+"""
+
+import argparse
+import csv
+import glob
+import json
+import multiprocessing
+import os
+import sys
+import time
+
+import document_extraction
+import export_stream
+import smarttender_service
+from parse_budget import ParseBudget
+
+SUPPORTED_EXTENSIONS = ('.pdf', '.docx', '.doc', '.txt', '.rtf', '.odt')
+
+CSV_COLUMNS = ["tender_file", "cv_file", "status"] + export_stream.EXPORT_COLUMNS + ["error"]
+
+# Per-worker cache: tender path -> (requirements, parse budget, error)
+_tender_cache = {}
+
+
+def collect_files(patterns):
+    """Expand files, directories (recursively) and glob patterns into a sorted list of documents."""
+    found = set()
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            for root, _, names in os.walk(pattern):
+                for name in names:
+                    if name.lower().endswith(SUPPORTED_EXTENSIONS):
+                        found.add(os.path.abspath(os.path.join(root, name)))
+        else:
+            for path in glob.glob(pattern, recursive=True):
+                if os.path.isfile(path):
+                    found.add(os.path.abspath(path))
+    return sorted(found)
+
+
+def read_document(path):
+    with open(path, 'rb') as f:
+        return document_extraction.extract_text(f, os.path.basename(path))
+
+
+def pair_key(tender_path, cv_path):
+    return f"{tender_path}\t{cv_path}"
+
+
+def parsed_tender(path):
+    """(requirements, parse budget, error) of a tender, cached for the life of the worker."""
+    if path not in _tender_cache:
+        try:
+            text = read_document(path).strip()
+            if not text:
+                raise ValueError("No text could be extracted from the tender")
+            budget = ParseBudget()
+            _tender_cache[path] = (smarttender_service.extract_tender_requirements(text, budget), budget, None)
+        except Exception as e:
+            _tender_cache[path] = (None, None, f"Tender: {e}")
+    return _tender_cache[path]
+
+
+def analyze_cv(job):
+    """Worker entry point: analyze one CV against each of its pending tenders, one record per pair."""
+    cv_path, tender_paths = job
+    try:
+        cv_text = read_document(cv_path).strip()
+        cv_error = None if cv_text else "No text could be extracted from the CV"
+    except Exception as e:
+        cv_text, cv_error = "", f"CV: {e}"
+
+    records = []
+    for tender_path in tender_paths:
+        record = {"tender_file": tender_path, "cv_file": cv_path}
+        tender_data, tender_budget, error = parsed_tender(tender_path)
+        error = error or cv_error
+        if error:
+            record["status"] = "error"
+            record["error"] = error
+            records.append(record)
+            continue
+
+        result = smarttender_service.run_tender_analysis(
+            tender_data, tender_budget, cv_text, cv_filename=os.path.basename(cv_path)
+        )
+        record["status"] = result["status"]
+        if result["status"] == "error":
+            record["error"] = result["error"]
+        else:
+            record["analysis"] = result["analysis"]
+        records.append(record)
+    return records
+
+
+def csv_row(record):
+    row = {
+        "tender_file": record["tender_file"],
+        "cv_file": record["cv_file"],
+        "status": record["status"],
+        "error": record.get("error", ""),
+    }
+    if record.get("analysis"):
+        row.update(export_stream.summary_row(record["analysis"]))
+    return row
+
+
+class ResultWriter:
+    """Appends records to a JSONL or CSV file, flushing after each one."""
+
+    def __init__(self, path, fmt):
+        self.fmt = fmt
+        is_new = not os.path.exists(path) or os.path.getsize(path) == 0
+        self.file = open(path, 'a', encoding='utf-8', newline='')
+        self.csv_writer = None
+        if fmt == 'csv':
+            self.csv_writer = csv.DictWriter(self.file, fieldnames=CSV_COLUMNS)
+            if is_new:
+                self.csv_writer.writeheader()
+
+    def write(self, record):
+        if self.csv_writer:
+            self.csv_writer.writerow(export_stream.csv_safe(csv_row(record)))
+        else:
+            self.file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+def load_checkpoint(path):
+    if not os.path.exists(path):
+        return set()
+    with open(path, encoding='utf-8') as f:
+        return {line.rstrip("\n") for line in f if line.strip()}
+
+
+def report_progress(done, total, errors, started):
+    elapsed = time.monotonic() - started
+    rate = done / elapsed if elapsed > 0 else 0.0
+    remaining = (total - done) / rate if rate > 0 else 0.0
+    sys.stderr.write(f"\r{done}/{total} pairs  {rate:.1f} pairs/s  {errors} errors  ETA {remaining:.0f}s   ")
+    sys.stderr.flush()
+
+
+def run_batch(tender_files, cv_files, output, fmt, checkpoint_path, workers, chunksize):
+    completed = load_checkpoint(checkpoint_path)
+    jobs = []
+    for c in cv_files:
+        pending = [t for t in tender_files if pair_key(t, c) not in completed]
+        if pending:
+            jobs.append((c, pending))
+    pairs = sum(len(pending) for _, pending in jobs)
+    skipped = len(tender_files) * len(cv_files) - pairs
+    if skipped:
+        print(f"Resuming: {skipped} pairs already done according to {checkpoint_path}")
+    if not pairs:
+        print("Nothing to do.")
+        return 0
+
+    writer = ResultWriter(output, fmt)
+    errors = 0
+    started = time.monotonic()
+    last_report = 0.0
+    try:
+        with open(checkpoint_path, 'a', encoding='utf-8') as checkpoint, \
+                multiprocessing.Pool(processes=workers) as pool:
+            done = 0
+            for records in pool.imap_unordered(analyze_cv, jobs, chunksize=chunksize):
+                for record in records:
+                    writer.write(record)
+                    # Only checkpoint once the result is safely on disk.
+                    checkpoint.write(pair_key(record["tender_file"], record["cv_file"]) + "\n")
+                    checkpoint.flush()
+                    if record["status"] != "success":
+                        errors += 1
+                done += len(records)
+                now = time.monotonic()
+                if now - last_report >= 1.0 or done == pairs:
+                    report_progress(done, pairs, errors, started)
+                    last_report = now
+    finally:
+        writer.close()
+        sys.stderr.write("\n")
+
+    elapsed = time.monotonic() - started
+    print(f"Analyzed {pairs} pairs in {elapsed:.1f}s ({pairs / elapsed:.1f} pairs/s), {errors} errors")
+    return errors
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run SmartTender analysis over directories of tenders and CVs.")
+    parser.add_argument("--tenders", nargs="+", required=True, help="tender files, directories or glob patterns")
+    parser.add_argument("--cvs", nargs="+", required=True, help="CV files, directories or glob patterns")
+    parser.add_argument("--output", required=True, help="results file (.jsonl or .csv)")
+    parser.add_argument("--format", choices=["jsonl", "csv"], help="output format (default: from --output extension)")
+    parser.add_argument("--checkpoint", help="checkpoint file (default: <output>.checkpoint)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunksize", type=int, default=4)
+    args = parser.parse_args(argv)
+
+    fmt = args.format or ('csv' if args.output.lower().endswith('.csv') else 'jsonl')
+    checkpoint_path = args.checkpoint or args.output + ".checkpoint"
+
+    tender_files = collect_files(args.tenders)
+    cv_files = collect_files(args.cvs)
+    if not tender_files:
+        parser.error("no tender documents found")
+    if not cv_files:
+        parser.error("no CV documents found")
+    print(f"{len(tender_files)} tenders x {len(cv_files)} CVs, {args.workers} workers")
+
+    errors = run_batch(tender_files, cv_files, args.output, fmt, checkpoint_path, args.workers, args.chunksize)
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
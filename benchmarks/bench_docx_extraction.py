@@ -0,0 +1,126 @@
+"""
+Benchmark: streaming DOCX extractor vs. the python-docx object model.
+
+Generates large synthetic CV / tender documents (paragraphs plus a skills
+table) and times both extraction paths. Peak memory is measured with
+tracemalloc, which only sees Python allocations: lxml's C-level tree behind
+python-docx is not counted, so its real footprint is higher than reported.
+
+Usage:
+    python benchmarks/bench_docx_extraction.py [--paragraphs 20000] [--rows 2000] [--repeat 3]
+"""
+
+import argparse
+import io
+import os
+import sys
+import time
+import tracemalloc
+import zipfile
+from xml.sax.saxutils import escape
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import docx_extractor
+
+try:
+    import docx
+    HAS_PYTHON_DOCX = True
+except ImportError:
+    HAS_PYTHON_DOCX = False
+
+CONTENT_TYPES = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">
+<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>
+<Default Extension="xml" ContentType="application/xml"/>
+<Override PartName="/word/document.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>
+</Types>"""
+
+ROOT_RELS = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="word/document.xml"/>
+</Relationships>"""
+
+SKILLS = ["Python", "AWS", "Docker", "Kubernetes", "SQL", "React", "Java", "Azure", "Scrum", "Terraform"]
+
+
+def _paragraph(text):
+    return f'<w:p><w:r><w:t xml:space="preserve">{escape(text)}</w:t></w:r></w:p>'
+
+
+def build_docx(num_paragraphs, num_rows):
+    """Build a .docx in memory with `num_paragraphs` paragraphs and a `num_rows` skills table."""
+    parts = ['<?xml version="1.0" encoding="UTF-8" standalone="yes"?>',
+             '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"><w:body>',
+             _paragraph("Jane Consultant"),
+             _paragraph("12 years of experience in cloud delivery")]
+    for i in range(num_paragraphs):
+        parts.append(_paragraph(f"Project {i}: delivered a {SKILLS[i % len(SKILLS)]} platform for a public sector client."))
+    parts.append("<w:tbl>")
+    for i in range(num_rows):
+        parts.append("<w:tr>")
+        for cell in (SKILLS[i % len(SKILLS)], "Expert", f"{i % 15} years"):
+            parts.append(f"<w:tc>{_paragraph(cell)}</w:tc>")
+        parts.append("</w:tr>")
+    parts.append("</w:tbl>")
+    parts.append("</w:body></w:document>")
+
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("[Content_Types].xml", CONTENT_TYPES)
+        archive.writestr("_rels/.rels", ROOT_RELS)
+        archive.writestr("word/document.xml", "".join(parts))
+    return buf.getvalue()
+
+
+def extract_python_docx(data):
+    """The pre-streaming extraction path (paragraphs only, tables skipped)."""
+    doc = docx.Document(io.BytesIO(data))
+    text = ""
+    for para in doc.paragraphs:
+        text += para.text + "\n"
+    return text
+
+
+def extract_streaming(data):
+    return docx_extractor.extract_docx_text(io.BytesIO(data))
+
+
+def measure(func, data, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        text = func(data)
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    func(data)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak, text
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--paragraphs", type=int, default=20000)
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    data = build_docx(args.paragraphs, args.rows)
+    print(f"Document: {args.paragraphs} paragraphs, {args.rows} table rows, {len(data) / 1024:.0f} KiB zipped")
+
+    candidates = [("streaming", extract_streaming)]
+    if HAS_PYTHON_DOCX:
+        candidates.append(("python-docx", extract_python_docx))
+    else:
+        print("python-docx not installed; only the streaming extractor is measured")
+
+    print(f"{'extractor':<14}{'best time':>12}{'peak mem':>14}{'lines':>10}")
+    for name, func in candidates:
+        seconds, peak, text = measure(func, data, args.repeat)
+        print(f"{name:<14}{seconds * 1000:>10.1f}ms{peak / 1024 / 1024:>12.1f}MB{text.count(chr(10)):>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,218 @@
+"""
+Benchmark: throughput and text fidelity of every installed extraction backend.
+
+Runs each backend registered in document_extraction over a corpus directory
+and reports, per format and backend, files/s, MB/s and fidelity. Fidelity is
+the token-level F1 against `<file>.expected.txt` when that sidecar exists,
+otherwise against the output of the first backend in the default order.
+
+Usage:
+    python benchmarks/bench_extraction_backends.py --generate corpus/
+    python benchmarks/bench_extraction_backends.py corpus/ [--repeat 3]
+
+--generate writes a synthetic sample corpus (PDF, DOCX, ODT, RTF, TXT with
+expected-text sidecars) to the directory before benchmarking it.
+"""
+
+import argparse
+import io
+import os
+import re
+import sys
+import time
+import zipfile
+from collections import Counter, defaultdict
+from xml.sax.saxutils import escape
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import document_extraction
+from bench_docx_extraction import build_docx
+
+SAMPLE_LINES = [
+    "Jane Consultant",
+    "Senior Cloud Architect with 12 years of experience",
+    "Skills: Python, AWS, Docker, Kubernetes, Terraform",
+    "Certifications: AWS Solutions Architect, PMP",
+    "Sector: Public Sector",
+]
+
+
+def sample_lines(num_lines):
+    lines = list(SAMPLE_LINES)
+    for i in range(num_lines):
+        lines.append(f"Project {i} delivered a data platform migration for client {i % 37}")
+    return lines
+
+
+# --- synthetic corpus ---------------------------------------------------------
+
+def build_pdf(lines, lines_per_page=50):
+    """Minimal multi-page PDF using the built-in Helvetica font."""
+    pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)] or [[]]
+    objects = []
+
+    def add(body):
+        objects.append(body)
+        return len(objects)
+
+    font_id = add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+    pages_id = add(None)  # filled in once the page ids are known
+    page_ids = []
+    for page_lines in pages:
+        ops = ["BT /F1 10 Tf 12 TL 40 800 Td"]
+        for line in page_lines:
+            safe = line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+            ops.append(f"({safe}) '")
+        ops.append("ET")
+        stream = "\n".join(ops).encode("latin-1")
+        content_id = add(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        page_ids.append(add(
+            b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 595 842] "
+            b"/Resources << /Font << /F1 %d 0 R >> >> /Contents %d 0 R >>" % (pages_id, font_id, content_id)
+        ))
+    kids = b" ".join(b"%d 0 R" % pid for pid in page_ids)
+    objects[pages_id - 1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, len(page_ids))
+    catalog_id = add(b"<< /Type /Catalog /Pages %d 0 R >>" % pages_id)
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for num, body in enumerate(objects, start=1):
+        offsets.append(out.tell())
+        out.write(b"%d 0 obj\n%s\nendobj\n" % (num, body))
+    xref = out.tell()
+    out.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    for offset in offsets:
+        out.write(b"%010d 00000 n \n" % offset)
+    out.write(b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, catalog_id, xref))
+    return out.getvalue()
+
+
+def build_odt(lines):
+    body = "".join(f"<text:p>{escape(line)}</text:p>" for line in lines)
+    content = (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<office:document-content xmlns:office="urn:oasis:names:tc:opendocument:xmlns:office:1.0" '
+        'xmlns:text="urn:oasis:names:tc:opendocument:xmlns:text:1.0" '
+        'xmlns:table="urn:oasis:names:tc:opendocument:xmlns:table:1.0">'
+        f'<office:body><office:text>{body}</office:text></office:body></office:document-content>'
+    )
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("mimetype", "application/vnd.oasis.opendocument.text")
+        archive.writestr("content.xml", content)
+    return buf.getvalue()
+
+
+def build_rtf(lines):
+    body = "".join(line.replace("\\", "\\\\").replace("{", "\\{").replace("}", "\\}") + "\\par\n" for line in lines)
+    return ("{\\rtf1\\ansi{\\fonttbl{\\f0 Helvetica;}}\\f0\\fs20\n" + body + "}").encode("latin-1")
+
+
+def generate_corpus(directory, sizes=(50, 500, 5000)):
+    os.makedirs(directory, exist_ok=True)
+    for size in sizes:
+        lines = sample_lines(size)
+        expected = "\n".join(lines)
+        docs = {
+            "pdf": build_pdf(lines),
+            "odt": build_odt(lines),
+            "rtf": build_rtf(lines),
+            "txt": expected.encode("utf-8"),
+        }
+        for ext, data in docs.items():
+            name = f"sample_{size}.{ext}"
+            with open(os.path.join(directory, name), "wb") as f:
+                f.write(data)
+            with open(os.path.join(directory, name + ".expected.txt"), "w", encoding="utf-8") as f:
+                f.write(expected)
+        # build_docx writes its own generated content; no sidecar, reference backend is used
+        with open(os.path.join(directory, f"sample_{size}.docx"), "wb") as f:
+            f.write(build_docx(size, size // 10))
+    print(f"Generated sample corpus in {directory}")
+
+
+# --- benchmark ----------------------------------------------------------------
+
+def tokens(text):
+    return Counter(re.findall(r"\w+", text.lower()))
+
+
+def token_f1(candidate, reference):
+    cand, ref = tokens(candidate), tokens(reference)
+    overlap = sum((cand & ref).values())
+    if not cand or not ref or not overlap:
+        return 1.0 if not cand and not ref else 0.0
+    precision = overlap / sum(cand.values())
+    recall = overlap / sum(ref.values())
+    return 2 * precision * recall / (precision + recall)
+
+
+def run(directory, repeat):
+    files = sorted(
+        f for f in os.listdir(directory)
+        if not f.endswith(".expected.txt") and os.path.isfile(os.path.join(directory, f))
+    )
+    # (format, backend) -> [seconds, bytes, files, fidelity sum, failures]
+    stats = defaultdict(lambda: [0.0, 0, 0, 0.0, 0])
+
+    for name in files:
+        path = os.path.join(directory, name)
+        with open(path, "rb") as f:
+            data = f.read()
+        fmt = document_extraction.detect_format(name)
+
+        expected_path = path + ".expected.txt"
+        reference = None
+        if os.path.exists(expected_path):
+            with open(expected_path, encoding="utf-8") as f:
+                reference = f.read()
+
+        for backend in document_extraction.backends_for(fmt):
+            best = float("inf")
+            text = ""
+            try:
+                for _ in range(repeat):
+                    start = time.perf_counter()
+                    text = backend["extract"](io.BytesIO(data))
+                    best = min(best, time.perf_counter() - start)
+            except Exception as e:
+                print(f"  {fmt}/{backend['name']} failed on {name}: {e}")
+                stats[(fmt, backend["name"])][4] += 1
+                continue
+            if reference is None:
+                reference = text
+            entry = stats[(fmt, backend["name"])]
+            entry[0] += best
+            entry[1] += len(data)
+            entry[2] += 1
+            entry[3] += token_f1(text, reference)
+
+    print(f"{'format':<7}{'backend':<13}{'files':>6}{'files/s':>10}{'MB/s':>9}{'fidelity':>10}{'failed':>8}")
+    for (fmt, backend), (seconds, size, count, fidelity, failed) in sorted(stats.items()):
+        if count:
+            print(f"{fmt:<7}{backend:<13}{count:>6}{count / seconds:>10.1f}"
+                  f"{size / seconds / 1024 / 1024:>9.2f}{fidelity / count:>10.3f}{failed:>8}")
+        else:
+            print(f"{fmt:<7}{backend:<13}{0:>6}{'-':>10}{'-':>9}{'-':>10}{failed:>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("corpus", nargs="?", help="directory of sample documents")
+    parser.add_argument("--generate", metavar="DIR", help="write a synthetic corpus to DIR and benchmark it")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    directory = args.generate or args.corpus
+    if not directory:
+        parser.error("give a corpus directory or --generate DIR")
+    if args.generate:
+        generate_corpus(args.generate)
+    run(directory, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
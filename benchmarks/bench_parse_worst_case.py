@@ -0,0 +1,134 @@
+"""
+Benchmark: regex parsers on hostile inputs, checking that cost grows linearly.
+
+Each generator builds a document of a given size designed to trigger
+backtracking in naive patterns (long digit runs, whitespace floods, labels
+repeated on one line, endless bullet lists, unterminated sections, regex
+metacharacters next to labels). Every parser runs with the size cap and time
+budget disabled, at doubling sizes; a size step whose time ratio exceeds
+--max-ratio (quadratic growth would give ~4) is reported and makes the script
+exit non-zero.
+
+A final pass runs the default budgets on documents larger than the size cap
+and reports which results were flagged as partial.
+
+Usage:
+    python benchmarks/bench_parse_worst_case.py [--min-size 50000] [--steps 4] [--max-ratio 2.8]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import app
+import parse_budget
+import smarttender_service
+
+
+def _repeat(unit, size):
+    return (unit * (size // len(unit) + 1))[:size]
+
+
+HOSTILE = {
+    "digit run": lambda n: _repeat("1", n),
+    "digits + spaces": lambda n: "1" + " " * (n - 1),
+    "digit, space, plus": lambda n: _repeat("1 + ", n),
+    "years without digits": lambda n: _repeat(" + years", n),
+    "label flood, one line": lambda n: _repeat("SkillsExperienceRoleSector", n),
+    "label + whitespace flood": lambda n: "Skills:" + _repeat(" \t", n - 8) + "\n",
+    "unterminated section": lambda n: "Skills: " + _repeat("python aws docker ", n - 8),
+    "blank-ish lines": lambda n: "Skills:\n" + _repeat("\n  \t ", n - 8),
+    "bullet flood": lambda n: "Skills\n" + _repeat("- x\n", n - 7),
+    "label per line": lambda n: _repeat("Skills\n", n),
+    "metacharacters": lambda n: _repeat("Skills(+*?)[C++]{2}|\\", n),
+    "minimum + spaces": lambda n: _repeat("minimum " + " " * 64 + "of ", n),
+    "experience + digits": lambda n: _repeat("experience: 12345678901234567890 ", n),
+}
+
+
+def fuzz(n, seed=7):
+    rng = random.Random(seed)
+    pieces = ["Skills", "Role", "Experience", "years", "+", "1", "99", " ", "  ", "\n", "\n\n", ":", "-", "*", "•",
+              "Certifications", "minimum of", "C++", "(", "[", "|", "Sector", "\t"]
+    out, length = [], 0
+    while length < n:
+        piece = rng.choice(pieces)
+        out.append(piece)
+        length += len(piece)
+    return "".join(out)[:n]
+
+
+HOSTILE["random fuzz"] = fuzz
+
+UNBOUNDED = dict(max_chars=10 ** 12, seconds=10 ** 6)
+
+PARSERS = {
+    "extract_tender_requirements": lambda text: smarttender_service.extract_tender_requirements(
+        text, parse_budget.ParseBudget(**UNBOUNDED)),
+    "extract_cv_data": lambda text: smarttender_service.extract_cv_data(
+        text, "cv.txt", parse_budget.ParseBudget(**UNBOUNDED)),
+    "app.parse_tender_requirements": lambda text: app.parse_tender_requirements(
+        text, parse_budget.ParseBudget(**UNBOUNDED)),
+    "app.parse_candidate_profile": lambda text: app.parse_candidate_profile(
+        text, "cv.txt", parse_budget.ParseBudget(**UNBOUNDED)),
+}
+
+
+def timed(parse, text, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        parse(text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--min-size", type=int, default=50_000, help="smallest document, in characters")
+    parser.add_argument("--steps", type=int, default=4, help="number of size doublings")
+    parser.add_argument("--max-ratio", type=float, default=2.8, help="largest accepted time ratio per doubling")
+    args = parser.parse_args()
+
+    sizes = [args.min_size * 2 ** i for i in range(args.steps + 1)]
+    # Below this, timer noise dominates the ratio
+    floor = 0.002
+    failures = []
+
+    print(f"sizes: {', '.join(f'{s:,}' for s in sizes)} chars")
+    for case, build in HOSTILE.items():
+        docs = [build(size) for size in sizes]
+        for name, parse in PARSERS.items():
+            times = [timed(parse, doc) for doc in docs]
+            ratios = [b / a for a, b in zip(times, times[1:]) if b > floor]
+            worst = max(ratios, default=1.0)
+            flag = "FAIL" if worst > args.max_ratio else "ok"
+            if flag == "FAIL":
+                failures.append((case, name))
+            print(f"{flag:4} {case:26} {name:31} "
+                  f"{' '.join(f'{t * 1000:8.2f}' for t in times)} ms  worst x{worst:.2f}")
+
+    print()
+    oversized = parse_budget.MAX_DOCUMENT_CHARS * 2
+    print(f"default budgets ({parse_budget.MAX_DOCUMENT_CHARS:,} chars, {parse_budget.TIME_BUDGET_SECONDS}s) "
+          f"on {oversized:,}-char documents:")
+    for case, build in HOSTILE.items():
+        doc = build(oversized)
+        budget = parse_budget.ParseBudget()
+        start = time.perf_counter()
+        smarttender_service.extract_cv_data(doc, "cv.txt", budget)
+        elapsed = time.perf_counter() - start
+        print(f"  {case:26} {elapsed * 1000:8.2f} ms  partial={budget.exceeded}")
+
+    if failures:
+        print(f"\n{len(failures)} super-linear case(s): {failures}")
+        sys.exit(1)
+    print("\nall parsers scale linearly")
+
+
+if __name__ == "__main__":
+    main()
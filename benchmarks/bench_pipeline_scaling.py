@@ -0,0 +1,85 @@
+"""
+Benchmark: the per-CV pipeline stages (pipeline.map_ordered) from 1 to N workers.
+
+Generates synthetic CVs as uploaded files, then times both stages at each
+worker count:
+
+  parse  app.parse_upload: text extraction, both parsers, MinHash signature
+  match  app.match_profile against one tender, on the parsed profiles
+
+Every parallel run must return exactly the serial results, in the same
+order; a mismatch makes the script exit non-zero. Speedup is relative to
+the 1-worker (serial) run and is bounded by the cores actually available.
+Each pool is started and warmed up before it is timed.
+
+Usage:
+    python benchmarks/bench_pipeline_scaling.py [--cvs 5000] [--workers 1,2,4] [--chunk-size 32] [--docx]
+"""
+
+import argparse
+import functools
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import app
+import pipeline
+from bench_docx_extraction import build_docx
+from bench_profile_memory import make_cv
+
+TENDER = ("Role: Cloud Architect\nRequired Skills: Python, AWS, Kubernetes, Terraform, Kafka\n"
+          "Certifications: AWS Solutions Architect, CKA\nSector: Banking\n5+ years of experience\n")
+
+
+def timed(func, items, workers, chunk_size):
+    start = time.perf_counter()
+    results = pipeline.map_ordered(func, items, workers=workers, chunk_size=chunk_size, min_items=0)
+    return time.perf_counter() - start, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cvs", type=int, default=5000)
+    parser.add_argument("--workers", default=",".join(str(w) for w in sorted({1, 2, 4, pipeline.DEFAULT_WORKERS})),
+                        help="comma-separated worker counts")
+    parser.add_argument("--chunk-size", type=int, default=pipeline.DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--docx", action="store_true", help="upload .docx files instead of plain text")
+    args = parser.parse_args()
+
+    workers = sorted({int(w) for w in args.workers.split(",")} | {1})
+    rng = random.Random(42)
+    if args.docx:
+        uploads = [(f"cv_{i}.docx", build_docx(40, 10)) for i in range(args.cvs)]
+    else:
+        uploads = [(f"cv_{i}.txt", make_cv(i, rng).encode("utf-8")) for i in range(args.cvs)]
+    tender_reqs = app.parse_tender_requirements(TENDER)
+    match = functools.partial(app.match_profile, tender_reqs)
+
+    print(f"{args.cvs:,} CVs, chunk size {args.chunk_size}, {os.cpu_count()} CPU(s)")
+    print(f"{'workers':>7} {'parse s':>9} {'CV/s':>9} {'speedup':>8} {'match s':>9} {'CV/s':>9} {'speedup':>8}")
+    baseline, mismatches = None, []
+    for count in workers:
+        # Start the workers (and their imports) outside the timings
+        pipeline.map_ordered(app.parse_upload, uploads[:count * args.chunk_size * 2], count, args.chunk_size, 0)
+        parse_time, parsed = timed(app.parse_upload, uploads, count, args.chunk_size)
+        profiles = [profile for _, profile, _, _, _ in parsed]
+        match_time, matched = timed(match, profiles, count, args.chunk_size)
+        if baseline is None:
+            baseline = (parse_time, parsed, match_time, matched)
+        elif parsed != baseline[1] or matched != baseline[3]:
+            mismatches.append(count)
+        print(f"{count:7d} {parse_time:9.2f} {args.cvs / parse_time:9.0f} {baseline[0] / parse_time:7.2f}x "
+              f"{match_time:9.2f} {args.cvs / match_time:9.0f} {baseline[2] / match_time:7.2f}x")
+    pipeline.shutdown()
+
+    if mismatches:
+        print(f"\nresults differ from serial mode with {mismatches} workers")
+        sys.exit(1)
+    print("\nparallel results identical to serial mode")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Benchmark: memory of a parsed bench, dicts + raw text vs. CompactProfile.
+
+Generates synthetic CVs drawing skills, certifications and sectors from a
+realistic pool, parses them with both parsers, then measures (tracemalloc)
+what it costs to keep the bench in memory:
+
+  dicts    raw text + parse_candidate_profile dict + extract_cv_data dict
+  compact  profile_store.CompactProfile with the shared vocabulary
+
+Usage:
+    python benchmarks/bench_profile_memory.py [--cvs 20000]
+"""
+
+import argparse
+import gc
+import os
+import random
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import app
+import profile_store
+import smarttender_service
+
+SKILLS = ["Python", "AWS", "Docker", "Kubernetes", "SQL", "React", "Java", "Azure", "Scrum", "Terraform",
+          "Node.js", "TypeScript", "GCP", "Spark", "Kafka", "Ansible", "Jenkins", "Go", "C#", "Angular"]
+CERTS = ["AWS Solutions Architect", "PMP", "CKA", "Azure Administrator", "ITIL Foundation", "Scrum Master"]
+SECTORS = ["Banking", "Public Sector", "Energy", "Retail", "Telecom", "Healthcare"]
+
+
+def make_cv(i, rng):
+    skills = ", ".join(rng.sample(SKILLS, 8))
+    certs = ", ".join(rng.sample(CERTS, 2))
+    projects = "\n".join(f"- Project {j}: {rng.choice(SKILLS)} delivery for a {rng.choice(SECTORS)} client"
+                         for j in range(20))
+    return (f"Consultant {i}\n{rng.randint(2, 20)} years of experience\n\n"
+            f"Skills: {skills}\n\nCertifications: {certs}\n\nSector: {rng.choice(SECTORS)}\n\n"
+            f"Experience\n{projects}\n")
+
+
+def measure(build):
+    gc.collect()
+    tracemalloc.start()
+    kept = build()
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current, kept
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cvs", type=int, default=20000)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    texts = [(f"cv_{i}.txt", make_cv(i, rng)) for i in range(args.cvs)]
+
+    def build_dicts():
+        # Copy the text so the baseline owns its strings like uploaded CVs do
+        return [
+            {
+                "filename": filename,
+                "text": "".join(list(text)),
+                "profile": app.parse_candidate_profile(text, filename),
+                "candidate": smarttender_service.extract_cv_data(text, filename)["candidate"],
+            }
+            for filename, text in texts
+        ]
+
+    def build_compact():
+        return [
+            profile_store.CompactProfile.from_parsed(
+                filename,
+                app.parse_candidate_profile(text, filename),
+                smarttender_service.extract_cv_data(text, filename)["candidate"],
+            )
+            for filename, text in texts
+        ]
+
+    dict_bytes, dicts = measure(build_dicts)
+    del dicts
+    compact_bytes, compact = measure(build_compact)
+
+    # Round trip check: the compact form must rebuild the original shapes
+    for (filename, text), record in zip(texts[:100], compact):
+        assert record.profile_dict() == app.parse_candidate_profile(text, filename)
+        assert record.candidate_dict() == smarttender_service.extract_cv_data(text, filename)
+
+    print(f"{args.cvs} CVs, vocabulary of {len(profile_store.VOCABULARY)} strings")
+    print(f"dicts + raw text : {dict_bytes / 1024 / 1024:8.1f} MB  ({dict_bytes / args.cvs:,.0f} B/CV)")
+    print(f"compact profiles : {compact_bytes / 1024 / 1024:8.1f} MB  ({compact_bytes / args.cvs:,.0f} B/CV)")
+    print(f"saving           : {(1 - compact_bytes / dict_bytes) * 100:8.1f} %")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Import-time regression check.
+
+Imports each module in a fresh interpreter with `-X importtime` and fails
+(exit code 1) when:
+  - the cumulative import time exceeds the module's budget, or
+  - a dependency that must stay lazy was imported eagerly.
+
+Budgets are in milliseconds, taken as the best of several runs to smooth out
+noise, and can be scaled for slow CI machines with IMPORT_BUDGET_SCALE=2.
+
+Usage:
+    python benchmarks/check_import_time.py [--runs 5] [--verbose]
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+
+REPO_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+# Heavy or optional dependencies that are only needed on specific code paths.
+LAZY_MODULES = ["groq", "dotenv", "PyPDF2", "pypdf", "fitz", "pdfminer", "docx", "smtplib", "email.mime"]
+
+# module -> (budget in ms, modules that must not be imported)
+CHECKS = {
+    "smarttender_service": (40, LAZY_MODULES + ["flask", "werkzeug", "flask_cors"]),
+    "document_extraction": (40, LAZY_MODULES + ["flask", "werkzeug"]),
+    "llm_service": (40, LAZY_MODULES + ["flask"]),
+    # Flask itself dominates app start-up; flask_cors is needed to build the app.
+    "app": (400, LAZY_MODULES),
+}
+
+_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def import_profile(module):
+    """Return ({module name: cumulative µs}, top-level cumulative µs) for one fresh import."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO_ROOT, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr}")
+
+    imported = {}
+    total = 0
+    for line in result.stderr.splitlines():
+        match = _LINE.match(line)
+        if not match:
+            continue
+        cumulative, name = int(match.group(2)), match.group(4)
+        imported[name] = cumulative
+        if name == module:
+            total = cumulative
+    return imported, total
+
+
+def check(module, budget_ms, forbidden, runs, scale, verbose):
+    best_total = None
+    imported = {}
+    for _ in range(runs):
+        imported, total = import_profile(module)
+        best_total = total if best_total is None else min(best_total, total)
+    elapsed_ms = best_total / 1000
+    budget = budget_ms * scale
+
+    failures = []
+    if elapsed_ms > budget:
+        failures.append(f"{elapsed_ms:.1f}ms exceeds budget of {budget:.0f}ms")
+    for name in forbidden:
+        eager = [m for m in imported if m == name or m.startswith(name + ".")]
+        if eager:
+            failures.append(f"eagerly imports {name}")
+
+    status = "FAIL" if failures else "ok"
+    print(f"{status:<5}{module:<24}{elapsed_ms:>8.1f}ms  (budget {budget:.0f}ms)")
+    for failure in failures:
+        print(f"       - {failure}")
+    if verbose:
+        slowest = sorted(imported.items(), key=lambda item: item[1], reverse=True)[:10]
+        for name, micros in slowest:
+            print(f"       {micros / 1000:>8.1f}ms  {name}")
+    return not failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--verbose", action="store_true", help="list the slowest imports per module")
+    args = parser.parse_args()
+
+    scale = float(os.environ.get("IMPORT_BUDGET_SCALE", "1"))
+    ok = True
+    for module, (budget_ms, forbidden) in CHECKS.items():
+        ok = check(module, budget_ms, forbidden, args.runs, scale, args.verbose) and ok
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+"""
+Local stand-ins for the external services app.py talks to, for load tests.
+
+FakeGroqServer  OpenAI-compatible /openai/v1/chat/completions endpoint (what
+                the Groq SDK calls) with injectable latency and failure rate.
+SMTPSink        Minimal SMTP server that accepts and counts every message.
+
+Both run on daemon threads and bind to an ephemeral port on 127.0.0.1.
+"""
+
+import json
+import random
+import socketserver
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+FAKE_REQUIREMENTS = {
+    "role": "Cloud Architect",
+    "skills": ["Python", "AWS", "Docker", "Kubernetes"],
+    "minimum_experience_years": "5",
+    "required_certifications": ["AWS Solutions Architect"],
+    "sector": "Public Sector",
+}
+
+FAKE_JUSTIFICATION = (
+    "The consultant covers the core required skills and meets the experience requirement. "
+    "Their certifications match the tender's compliance needs."
+)
+
+
+class FakeGroqServer:
+    """
+    `latency_ms` is the mean response delay (exponentially distributed when
+    `jitter` is set, fixed otherwise); `failure_rate` is the share of calls
+    answered with `failure_status` (500 by default, 429 to simulate rate limits).
+    """
+
+    def __init__(self, latency_ms=300.0, jitter=True, failure_rate=0.0, failure_status=500, seed=None):
+        self.latency_ms = latency_ms
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.failure_status = failure_status
+        self.calls = 0
+        self.failures = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler_class())
+        self._server.daemon_threads = True
+
+    @property
+    def url(self):
+        host, port = self._server.server_address
+        return f"http://{host}:{port}"
+
+    def start(self):
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _next_outcome(self):
+        with self._lock:
+            self.calls += 1
+            delay = self._rng.expovariate(1 / self.latency_ms) if self.jitter and self.latency_ms > 0 else self.latency_ms
+            failed = self._rng.random() < self.failure_rate
+            if failed:
+                self.failures += 1
+        return delay / 1000, failed
+
+    def _handler_class(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                body = json.loads(self.rfile.read(length) or b"{}")
+                delay, failed = fake._next_outcome()
+                time.sleep(delay)
+
+                if failed:
+                    self._send(fake.failure_status, {"error": {"message": "injected failure", "type": "server_error"}})
+                    return
+
+                prompt = " ".join(m.get("content", "") for m in body.get("messages", []))
+                if "Extract structured requirements" in prompt:
+                    content = json.dumps(FAKE_REQUIREMENTS)
+                else:
+                    content = FAKE_JUSTIFICATION
+                self._send(200, {
+                    "id": "chatcmpl-fake",
+                    "object": "chat.completion",
+                    "created": int(time.time()),
+                    "model": body.get("model", "fake"),
+                    "choices": [{"index": 0, "finish_reason": "stop",
+                                 "message": {"role": "assistant", "content": content}}],
+                    "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+                })
+
+            def _send(self, status, payload):
+                data = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+        return Handler
+
+
+class SMTPSink:
+    """Accepts any SMTP conversation and counts delivered messages."""
+
+    def __init__(self):
+        self.messages = 0
+        self._lock = threading.Lock()
+        self._server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), self._handler_class())
+        self._server.daemon_threads = True
+
+    @property
+    def port(self):
+        return self._server.server_address[1]
+
+    def start(self):
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _handler_class(self):
+        sink = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def reply(self, line):
+                self.wfile.write(line.encode("ascii") + b"\r\n")
+
+            def handle(self):
+                self.reply("220 smtp-sink ready")
+                in_data = False
+                for raw in self.rfile:
+                    line = raw.rstrip(b"\r\n")
+                    if in_data:
+                        if line == b".":
+                            in_data = False
+                            with sink._lock:
+                                sink.messages += 1
+                            self.reply("250 OK: queued")
+                        continue
+                    command = line[:4].upper()
+                    if command == b"EHLO":
+                        self.reply("250 smtp-sink")
+                    elif command == b"DATA":
+                        in_data = True
+                        self.reply("354 End data with <CR><LF>.<CR><LF>")
+                    elif command == b"QUIT":
+                        self.reply("221 Bye")
+                        return
+                    else:
+                        # HELO, MAIL, RCPT, RSET, NOOP...
+                        self.reply("250 OK")
+
+        return Handler
@@ -0,0 +1,321 @@
+"""
+HTTP load test for app.py with local stand-ins for Groq and SMTP.
+
+Starts a fake Groq server and an SMTP sink (benchmarks/fake_services.py),
+launches app.py on a threaded werkzeug server wired to them (or targets an
+already running deployment with --target), seeds one tender and a batch of
+CVs, then drives the endpoints from N concurrent clients for a fixed time.
+
+Reports, per endpoint: requests, throughput, p50/p95/p99 latency, 429
+rejections (admission control) and error rate.
+
+Usage:
+    python benchmarks/loadtest.py --concurrency 16 --duration 30
+    python benchmarks/loadtest.py --mix intelligence=5,smarttender=5,mail=1 \\
+        --doc-mix txt=2,docx=1,pdf=1 --groq-latency 800 --groq-failure-rate 0.05
+    python benchmarks/loadtest.py --target http://127.0.0.1:5000 --no-llm
+"""
+
+import argparse
+import io
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+import uuid
+import zipfile
+from collections import defaultdict
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.join(BENCH_DIR, "..")
+sys.path.insert(0, BENCH_DIR)
+
+from fake_services import FakeGroqServer, SMTPSink
+from bench_docx_extraction import CONTENT_TYPES, ROOT_RELS, _paragraph
+from bench_extraction_backends import build_pdf
+
+ENDPOINTS = {
+    "upload-tender": ("POST", "/api/upload-tender"),
+    "upload-cvs": ("POST", "/api/upload-cvs"),
+    "intelligence": ("GET", "/api/intelligence/analyze"),
+    "smarttender": ("POST", "/api/smarttender/analyze"),
+    "mail": ("POST", "/api/send-validation-mail"),
+}
+
+DEFAULT_MIX = "upload-tender=1,upload-cvs=1,intelligence=4,smarttender=4,mail=2"
+
+SKILLS = ["Python", "AWS", "Docker", "Kubernetes", "SQL", "React", "Java", "Azure", "Scrum", "Terraform"]
+
+TENDER_TEXT = """Role: Cloud Architect
+Skills: Python, AWS, Docker, Kubernetes
+Minimum 5 years experience
+Certifications: AWS Solutions Architect
+Sector: Public Sector
+"""
+
+APP_BOOTSTRAP = (
+    "import sys; sys.path.insert(0, {root!r}); import app; "
+    "from werkzeug.serving import run_simple; "
+    "run_simple('127.0.0.1', {port}, app.app, threaded=True)"
+)
+
+
+# --- documents -----------------------------------------------------------------
+
+def cv_lines(rng, i, project_lines):
+    lines = [f"Consultant {i}", f"{rng.randint(1, 20)} years of experience", "",
+             "Skills: " + ", ".join(rng.sample(SKILLS, 5)), "",
+             "Certifications: AWS Solutions Architect", "", "Sector: Public Sector", ""]
+    lines += [f"- Project {j}: {rng.choice(SKILLS)} delivery" for j in range(project_lines)]
+    return lines
+
+
+def build_docx_from_lines(lines):
+    document = ('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"><w:body>'
+                + "".join(_paragraph(line) for line in lines) + "</w:body></w:document>")
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("[Content_Types].xml", CONTENT_TYPES)
+        archive.writestr("_rels/.rels", ROOT_RELS)
+        archive.writestr("word/document.xml", document)
+    return buf.getvalue()
+
+
+def make_document(fmt, lines):
+    """(filename extension, bytes) for a synthetic document in the given format."""
+    if fmt == "pdf":
+        return "pdf", build_pdf(lines)
+    if fmt == "docx":
+        return "docx", build_docx_from_lines(lines)
+    return "txt", "\n".join(lines).encode("utf-8")
+
+
+class DocumentPool:
+    def __init__(self, doc_mix, project_lines, size=50, seed=0):
+        rng = random.Random(seed)
+        formats, weights = zip(*doc_mix.items())
+        self.cvs = []
+        for i in range(size):
+            fmt = rng.choices(formats, weights)[0]
+            ext, data = make_document(fmt, cv_lines(rng, i, project_lines))
+            self.cvs.append((f"cv_{i}.{ext}", data))
+        self.cv_texts = ["\n".join(cv_lines(rng, i, project_lines)) for i in range(size)]
+
+
+# --- HTTP ------------------------------------------------------------------------
+
+def encode_multipart(files):
+    """files: list of (field, filename, bytes). Returns (body, content type)."""
+    boundary = uuid.uuid4().hex
+    parts = []
+    for field, filename, data in files:
+        parts.append(
+            f'--{boundary}\r\nContent-Disposition: form-data; name="{field}"; filename="{filename}"\r\n'
+            f'Content-Type: application/octet-stream\r\n\r\n'.encode("utf-8") + data + b"\r\n"
+        )
+    parts.append(f"--{boundary}--\r\n".encode("utf-8"))
+    return b"".join(parts), f"multipart/form-data; boundary={boundary}"
+
+
+def http_call(base_url, method, path, body=None, content_type=None, timeout=120):
+    """Returns (status, seconds). Status 0 means the request failed at the transport level."""
+    headers = {"Content-Type": content_type} if content_type else {}
+    req = urllib.request.Request(base_url + path, data=body, method=method, headers=headers)
+    started = time.perf_counter()
+    try:
+        with urllib.request.urlopen(req, timeout=timeout) as response:
+            response.read()
+            status = response.status
+    except urllib.error.HTTPError as e:
+        e.read()
+        status = e.code
+    except (urllib.error.URLError, OSError):
+        status = 0
+    return status, time.perf_counter() - started
+
+
+def build_request(name, pool, rng, cvs_per_upload):
+    if name == "upload-tender":
+        return encode_multipart([("file", "tender.txt", TENDER_TEXT.encode("utf-8"))])
+    if name == "upload-cvs":
+        batch = rng.sample(pool.cvs, min(cvs_per_upload, len(pool.cvs)))
+        return encode_multipart([("files", filename, data) for filename, data in batch])
+    if name == "smarttender":
+        payload = {"tender_text": TENDER_TEXT, "cv_text": rng.choice(pool.cv_texts), "cv_filename": "cv.txt"}
+        return json.dumps(payload).encode("utf-8"), "application/json"
+    if name == "mail":
+        payload = {"email": "consultant@example.com", "status": rng.choice(["Suitable", "Not suitable"]),
+                   "reason": "Load test message."}
+        return json.dumps(payload).encode("utf-8"), "application/json"
+    return None, None
+
+
+# --- app process -----------------------------------------------------------------
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_app(env_overrides):
+    port = free_port()
+    env = dict(os.environ, **env_overrides)
+    process = subprocess.Popen(
+        [sys.executable, "-c", APP_BOOTSTRAP.format(root=os.path.abspath(REPO_ROOT), port=port)],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError("app.py exited during start-up")
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.5):
+                return process, base_url
+        except OSError:
+            time.sleep(0.1)
+    process.terminate()
+    raise RuntimeError("app.py did not start within 30s")
+
+
+# --- load loop -------------------------------------------------------------------
+
+def parse_weights(spec, allowed):
+    weights = {}
+    for item in spec.split(","):
+        name, _, weight = item.partition("=")
+        name = name.strip()
+        if name not in allowed:
+            raise SystemExit(f"unknown name in mix: {name} (choose from {', '.join(allowed)})")
+        weights[name] = float(weight or 1)
+    return weights
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def run_load(base_url, mix, pool, concurrency, duration, cvs_per_upload, timeout):
+    names, weights = zip(*mix.items())
+    results = defaultdict(list)  # endpoint -> [(status, seconds)]
+    lock = threading.Lock()
+    stop_at = time.monotonic() + duration
+
+    def client(seed):
+        rng = random.Random(seed)
+        while time.monotonic() < stop_at:
+            name = rng.choices(names, weights)[0]
+            method, path = ENDPOINTS[name]
+            body, content_type = build_request(name, pool, rng, cvs_per_upload)
+            outcome = http_call(base_url, method, path, body, content_type, timeout)
+            with lock:
+                results[name].append(outcome)
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(concurrency)]
+    started = time.monotonic()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return results, time.monotonic() - started
+
+
+def report(results, elapsed):
+    print(f"\n{'endpoint':<15}{'reqs':>7}{'req/s':>8}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'429':>6}{'errors':>8}{'err %':>7}")
+    summary = {}
+    for name in ENDPOINTS:
+        outcomes = results.get(name, [])
+        if not outcomes:
+            continue
+        latencies = sorted(seconds * 1000 for _, seconds in outcomes)
+        rejected = sum(1 for status, _ in outcomes if status == 429)
+        errors = sum(1 for status, _ in outcomes if status == 0 or status >= 500)
+        row = {
+            "requests": len(outcomes),
+            "throughput": len(outcomes) / elapsed,
+            "p50_ms": percentile(latencies, 50),
+            "p95_ms": percentile(latencies, 95),
+            "p99_ms": percentile(latencies, 99),
+            "rejected_429": rejected,
+            "errors": errors,
+            "error_rate": errors / len(outcomes),
+        }
+        summary[name] = row
+        print(f"{name:<15}{row['requests']:>7}{row['throughput']:>8.1f}{row['p50_ms']:>9.0f}{row['p95_ms']:>9.0f}"
+              f"{row['p99_ms']:>9.0f}{rejected:>6}{errors:>8}{row['error_rate'] * 100:>6.1f}%")
+    total = sum(len(v) for v in results.values())
+    print(f"\n{total} requests in {elapsed:.1f}s ({total / elapsed:.1f} req/s overall)")
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--target", help="base URL of a running deployment (default: start app.py locally)")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=20, help="seconds of load")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="endpoint weights, e.g. " + DEFAULT_MIX)
+    parser.add_argument("--doc-mix", default="txt=2,docx=1,pdf=1", help="CV document formats and weights")
+    parser.add_argument("--cvs-per-upload", type=int, default=20)
+    parser.add_argument("--cv-size", type=int, default=30, help="project lines per synthetic CV")
+    parser.add_argument("--groq-latency", type=float, default=300, help="mean fake Groq latency in ms")
+    parser.add_argument("--groq-failure-rate", type=float, default=0.0)
+    parser.add_argument("--groq-failure-status", type=int, default=500)
+    parser.add_argument("--no-llm", action="store_true", help="run the app without a Groq key (rule-based only)")
+    parser.add_argument("--timeout", type=float, default=120, help="client timeout per request in seconds")
+    parser.add_argument("--json", help="also write the summary to this file")
+    args = parser.parse_args()
+
+    mix = parse_weights(args.mix, ENDPOINTS)
+    doc_mix = parse_weights(args.doc_mix, ["txt", "docx", "pdf"])
+    pool = DocumentPool(doc_mix, args.cv_size)
+
+    groq = FakeGroqServer(args.groq_latency, failure_rate=args.groq_failure_rate,
+                          failure_status=args.groq_failure_status).start()
+    smtp = SMTPSink().start()
+    process = None
+    try:
+        if args.target:
+            base_url = args.target.rstrip("/")
+        else:
+            process, base_url = start_app({
+                "GROQ_API_KEY": "" if args.no_llm else "fake-load-test-key",
+                "GROQ_BASE_URL": groq.url,
+                "SMTP_SERVER": "127.0.0.1",
+                "SMTP_PORT": str(smtp.port),
+            })
+        print(f"Target {base_url}, {args.concurrency} clients for {args.duration:.0f}s")
+
+        # Seed state so the analysis endpoints have something to work on
+        http_call(base_url, *ENDPOINTS["upload-tender"], *build_request("upload-tender", pool, random.Random(0), 0))
+        http_call(base_url, *ENDPOINTS["upload-cvs"],
+                  *build_request("upload-cvs", pool, random.Random(0), args.cvs_per_upload))
+
+        results, elapsed = run_load(base_url, mix, pool, args.concurrency, args.duration,
+                                    args.cvs_per_upload, args.timeout)
+        summary = report(results, elapsed)
+        print(f"fake Groq: {groq.calls} calls, {groq.failures} injected failures; SMTP sink: {smtp.messages} messages")
+        if args.json:
+            with open(args.json, "w", encoding="utf-8") as f:
+                json.dump({"elapsed_s": elapsed, "endpoints": summary,
+                           "groq_calls": groq.calls, "smtp_messages": smtp.messages}, f, indent=2)
+    finally:
+        if process:
+            process.terminate()
+            process.wait(timeout=10)
+        groq.stop()
+        smtp.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+"""
+The uploaded CVs, deduplicated and ranked against the current tender.
+
+CandidatePool replaces the plain list of CompactProfiles that upload_cvs used
+to rebuild on every call. CVs can be appended: each new CV is checked against
+the signatures of every CV uploaded so far (cv_dedup LSH). The CVs of an
+upload that survive dedup are then scored in one batch (through the
+pipeline's batch scorer, when set) and inserted into a sorted (-score,
+serial) index. Reading the ranking therefore costs nothing per candidate, and
+adding five CVs to a bench of thousands only scores those five. Everything is re-scored when the tender
+changes (`rescore`).
+
+Serials number CVs in upload order from 1 and are stable while the pool
+lives, so they double as candidate ids.
+
+Clusters follow cv_dedup.cluster: a CV joins every cluster it matches, and
+the last uploaded CV of a cluster represents it, listing the older ones in
+`duplicates`. Similar text is not enough to match: company templates make
+different consultants' CVs look alike, so the parsed candidate name
+(CompactProfile.identity) must also be the same, and CVs without one are
+never merged. Only representatives are iterated, ranked and scored.
+
+`state()` / `restore()` are used by the snapshot module. A restored pool
+keeps the saved ranking, builds result dicts lazily on first read, and builds
+its LSH index on the next append, so a warm start costs neither re-scoring
+nor re-indexing.
+"""
+
+import bisect
+import threading
+
+import cv_dedup
+
+
+class CandidatePool:
+    def __init__(self, threshold=cv_dedup.DEFAULT_THRESHOLD):
+        self.threshold = threshold
+        self._lock = threading.RLock()
+        self.scorer = None
+        self.batch_scorer = None
+        self._reset()
+
+    def _reset(self):
+        self._next_serial = 1
+        self._signatures = {}      # serial -> signature, every uploaded CV
+        self._index = None         # LSH index over _signatures, built when first needed
+        self._filenames = {}       # serial -> filename, every uploaded CV
+        self._cluster = {}         # serial -> serial of its cluster's representative
+        self._members = {}         # representative serial -> member serials, upload order
+        self._profiles = {}        # representative serial -> CompactProfile
+        self._scores = {}          # representative serial -> score
+        self._results = {}         # representative serial -> scorer output (filled lazily after restore)
+        self._ranking = []         # sorted (-score, serial) of scored representatives
+        self._justifications = {}  # representative serial -> AI justification paragraph
+
+    def __len__(self):
+        return len(self._profiles)
+
+    def __iter__(self):
+        """Representatives in upload order."""
+        return iter([profile for _, profile in self.items()])
+
+    def items(self):
+        """(serial, profile) of every representative, in upload order."""
+        with self._lock:
+            return [(serial, self._profiles[serial]) for serial in sorted(self._profiles)]
+
+    def uploaded(self):
+        """Number of CVs uploaded, duplicates included."""
+        return len(self._filenames)
+
+    def add(self, profiles, replace=False):
+        """
+        Append parsed CVs (CompactProfiles with a signature), in upload order.
+        With `replace`, the pool is emptied first; the scorer is kept.
+        """
+        with self._lock:
+            if replace:
+                self._reset()
+            added = [self._add(profile) for profile in profiles]
+            if self.scorer is not None:
+                # Score the batch's surviving representatives in one call
+                survivors = [serial for serial in added if serial in self._profiles]
+                for serial, result in zip(survivors, self._score_many(survivors)):
+                    self._results[serial] = result
+                    self._scores[serial] = result["score"]
+                    bisect.insort(self._ranking, (-result["score"], serial))
+
+    def _add(self, profile):
+        serial = self._next_serial
+        self._next_serial += 1
+        self._filenames[serial] = profile.filename
+
+        members = [serial]
+        if profile.signature is not None:
+            index = self._lsh_index()
+            identity = profile.identity()
+            for rep in sorted({self._cluster[m] for m in index.query(profile.signature)}):
+                # Every member of a cluster has its representative's identity
+                if identity is None or self._profiles[rep].identity() != identity:
+                    continue
+                members.extend(self._members.pop(rep))
+                self._discard(rep)
+            index.add(serial, profile.signature)
+            self._signatures[serial] = profile.signature
+        members.sort()
+
+        for member in members:
+            self._cluster[member] = serial
+        self._members[serial] = members
+        profile.duplicates = tuple(self._filenames[m] for m in members[:-1])
+        self._profiles[serial] = profile
+        return serial
+
+    def _lsh_index(self):
+        if self._index is None:
+            self._index = cv_dedup.LSHIndex(self.threshold)
+            for serial, signature in self._signatures.items():
+                self._index.add(serial, signature)
+        return self._index
+
+    def _discard(self, serial):
+        """Drop a representative from the ranking (its members stay indexed)."""
+        del self._profiles[serial]
+        self._justifications.pop(serial, None)
+        self._results.pop(serial, None)
+        score = self._scores.pop(serial, None)
+        if score is not None:
+            del self._ranking[bisect.bisect_left(self._ranking, (-score, serial))]
+
+    def _score_many(self, serials):
+        profiles = [self._profiles[serial] for serial in serials]
+        if self.batch_scorer is not None:
+            return self.batch_scorer(profiles)
+        return [self.scorer(profile) for profile in profiles]
+
+    def rescore(self, scorer, batch_scorer=None):
+        """
+        Score every representative with a new scorer (tender changed).
+        `batch_scorer`, if given, maps a list of profiles to the same results
+        as `scorer` in one call (see pipeline.map_ordered).
+        """
+        with self._lock:
+            self.scorer = scorer
+            self.batch_scorer = batch_scorer
+            self._results = {}
+            self._scores = {}
+            self._justifications = {}
+            self._ranking = []
+            serials = list(self._profiles)
+            for serial, result in zip(serials, self._score_many(serials)):
+                self._results[serial] = result
+                self._scores[serial] = result["score"]
+                self._ranking.append((-result["score"], serial))
+            self._ranking.sort()
+
+    def ranked(self, limit=None):
+        """(serial, profile, scorer output) by score descending, ties in upload order."""
+        with self._lock:
+            top = self._ranking if limit is None else self._ranking[:limit]
+            missing = [serial for _, serial in top if serial not in self._results]
+            if missing:
+                self._results.update(zip(missing, self._score_many(missing)))
+            return [(serial, self._profiles[serial], self._results[serial]) for _, serial in top]
+
+    def justification(self, serial):
+        return self._justifications.get(serial)
+
+    def set_justification(self, serial, text):
+        with self._lock:
+            if serial in self._profiles:
+                self._justifications[serial] = text
+
+    def state(self):
+        """Everything restore() needs, as a consistent copy."""
+        with self._lock:
+            return {
+                "next_serial": self._next_serial,
+                "filenames": dict(self._filenames),
+                "signatures": dict(self._signatures),
+                "members": dict(self._members),
+                "profiles": dict(self._profiles),
+                "ranking": [(serial, -negated) for negated, serial in self._ranking],
+            }
+
+    def restore(self, next_serial, filenames, signatures, members, profiles, ranking, scorer, batch_scorer=None):
+        """
+        Replace the pool's content with saved state. `ranking` is a list of
+        (serial, score) by rank and must have been produced by `scorer`.
+        """
+        with self._lock:
+            self._reset()
+            self._next_serial = next_serial
+            self._filenames = filenames
+            self._signatures = signatures
+            self._members = members
+            self._profiles = profiles
+            for representative, serials in members.items():
+                for member in serials:
+                    self._cluster[member] = representative
+            self.scorer = scorer
+            self.batch_scorer = batch_scorer
+            self._scores = {serial: score for serial, score in ranking}
+            self._ranking = [(-score, serial) for serial, score in ranking]
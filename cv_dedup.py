@@ -0,0 +1,161 @@
+"""
+Near-duplicate CV detection with MinHash + LSH.
+
+Benches often hold several versions of the same consultant's CV (yearly
+updates, slightly reworded variants). Each CV gets a MinHash signature of its
+word shingles; locality-sensitive hashing over signature bands finds
+candidate pairs without comparing every CV to every other one, and candidate
+pairs whose estimated Jaccard similarity reaches the threshold are merged
+into clusters.
+
+Signatures use one-permutation hashing: every shingle is hashed once and
+routed to one of NUM_PERM bins by its low bits, each bin keeping its minimum.
+Empty bins borrow the value of the next non-empty bin. This costs one hash per
+shingle instead of NUM_PERM, which keeps the whole stage near-linear.
+
+Documents with fewer than MIN_SHINGLES distinct shingles (empty text, failed
+extraction, a name and nothing else) get no signature and are never merged:
+their similarity says nothing about being the same CV.
+
+Signatures only depend on the text (crc32 shingle hashes, fixed hash seed),
+so they are stable across processes and restarts.
+"""
+
+import os
+import random
+import re
+import zlib
+from array import array
+
+NUM_PERM = 64
+BANDS = 16
+ROWS_PER_BAND = NUM_PERM // BANDS
+SHINGLE_SIZE = 3
+MIN_SHINGLES = 5
+
+DEFAULT_THRESHOLD = float(os.environ.get("CV_DEDUP_THRESHOLD", "0.8"))
+
+_PRIME = (1 << 61) - 1
+_rng = random.Random(20240917)
+_A = _rng.randrange(1, _PRIME)
+_B = _rng.randrange(0, _PRIME)
+_BIN_BITS = NUM_PERM.bit_length() - 1
+_EMPTY = 0xFFFFFFFF
+
+_TOKEN = re.compile(r'\w+')
+
+
+def _shingle_hashes(text):
+    tokens = _TOKEN.findall(text.lower())
+    if len(tokens) < SHINGLE_SIZE:
+        shingles = {" ".join(tokens)} if tokens else set()
+    else:
+        shingles = {" ".join(tokens[i:i + SHINGLE_SIZE]) for i in range(len(tokens) - SHINGLE_SIZE + 1)}
+    return [zlib.crc32(s.encode('utf-8')) for s in shingles]
+
+
+def signature(text):
+    """MinHash signature of a document: NUM_PERM 32-bit values, or None if it is too short to compare."""
+    hashes = _shingle_hashes(text)
+    if len(hashes) < MIN_SHINGLES:
+        return None
+    sig = [_EMPTY] * NUM_PERM
+    mask = NUM_PERM - 1
+    for h in hashes:
+        x = (_A * h + _B) % _PRIME
+        b = x & mask
+        v = (x >> _BIN_BITS) & 0xFFFFFFFE  # even values; _EMPTY is odd
+        if v < sig[b]:
+            sig[b] = v
+
+    # Densify: an empty bin takes the value of the next non-empty bin (circularly),
+    # tagged with the distance so borrowed values rarely collide by accident.
+    if _EMPTY in sig and any(v != _EMPTY for v in sig):
+        filled = list(sig)
+        for i in range(NUM_PERM):
+            if sig[i] == _EMPTY:
+                step = 1
+                while sig[(i + step) % NUM_PERM] == _EMPTY:
+                    step += 1
+                filled[i] = (sig[(i + step) % NUM_PERM] + step) & 0xFFFFFFFF
+        sig = filled
+    return array('I', sig)
+
+
+def similarity(sig_a, sig_b):
+    """Estimated Jaccard similarity of the two documents."""
+    return sum(1 for x, y in zip(sig_a, sig_b) if x == y) / NUM_PERM
+
+
+def _band_keys(sig):
+    for band in range(BANDS):
+        start = band * ROWS_PER_BAND
+        yield band, tuple(sig[start:start + ROWS_PER_BAND])
+
+
+class LSHIndex:
+    """Banded LSH index over signatures, keyed by arbitrary item ids."""
+
+    def __init__(self, threshold=DEFAULT_THRESHOLD):
+        self.threshold = threshold
+        self._buckets = {}
+        self._signatures = {}
+
+    def __len__(self):
+        return len(self._signatures)
+
+    def add(self, item_id, sig):
+        self._signatures[item_id] = sig
+        for key in _band_keys(sig):
+            self._buckets.setdefault(key, []).append(item_id)
+
+    def remove(self, item_id):
+        sig = self._signatures.pop(item_id, None)
+        if sig is None:
+            return
+        for key in _band_keys(sig):
+            bucket = self._buckets.get(key)
+            if bucket:
+                bucket.remove(item_id)
+                if not bucket:
+                    del self._buckets[key]
+
+    def query(self, sig):
+        """Ids of indexed items whose estimated similarity to `sig` reaches the threshold."""
+        candidates = set()
+        for key in _band_keys(sig):
+            candidates.update(self._buckets.get(key, ()))
+        return [item_id for item_id in candidates
+                if similarity(sig, self._signatures[item_id]) >= self.threshold]
+
+
+def cluster(signatures, threshold=DEFAULT_THRESHOLD):
+    """
+    Group near-identical documents.
+
+    Returns a list of clusters, each a sorted list of indexes into
+    `signatures`; documents without duplicates (or without a signature) form
+    singleton clusters.
+    """
+    parent = list(range(len(signatures)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    index = LSHIndex(threshold)
+    for i, sig in enumerate(signatures):
+        if sig is None:
+            continue
+        for j in index.query(sig):
+            root_i, root_j = find(i), find(j)
+            if root_i != root_j:
+                parent[root_i] = root_j
+        index.add(i, sig)
+
+    groups = {}
+    for i in range(len(signatures)):
+        groups.setdefault(find(i), []).append(i)
+    return sorted(groups.values())
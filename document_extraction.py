@@ -0,0 +1,250 @@
+"""
+Pluggable text extraction backends.
+
+Each document format (pdf, docx, txt, rtf, odt) has an ordered list of
+backends. `extract_text` tries them in order and falls back to the next one
+when a backend is not installed, raises, or returns no text.
+
+The order can be changed per format through the environment, e.g.:
+
+    EXTRACTION_BACKENDS_PDF=pymupdf,pypdf2
+    EXTRACTION_BACKENDS_DOCX=stream
+
+or at runtime with `configure("pdf", ["pdfminer", "pypdf2"])`. Extra engines
+are added with `register_backend`.
+"""
+
+import importlib.util
+import os
+import re
+import zipfile
+import xml.etree.ElementTree as ET
+
+import docx_extractor
+
+# format -> list of backend dicts, in default priority order
+BACKENDS = {}
+
+# format -> explicit backend order set through `configure`
+_configured_order = {}
+
+FORMAT_BY_EXTENSION = {
+    "pdf": "pdf",
+    "doc": "docx",
+    "docx": "docx",
+    "txt": "txt",
+    "rtf": "rtf",
+    "odt": "odt",
+}
+
+
+def register_backend(fmt, name, extract, requires=None):
+    """
+    Register an extraction backend.
+
+    `extract(stream)` receives a seekable binary stream positioned at 0 and
+    returns the document text. `requires` names the module the backend needs;
+    the backend is skipped when that module is not installed. Registering an
+    existing name replaces it in place.
+    """
+    backends = BACKENDS.setdefault(fmt, [])
+    backend = {"name": name, "extract": extract, "requires": requires}
+    for i, existing in enumerate(backends):
+        if existing["name"] == name:
+            backends[i] = backend
+            return
+    backends.append(backend)
+
+
+def configure(fmt, names):
+    """Set the backend order for a format. Pass None to restore the default."""
+    if names is None:
+        _configured_order.pop(fmt, None)
+    else:
+        _configured_order[fmt] = list(names)
+
+
+def is_available(backend):
+    requires = backend["requires"]
+    return requires is None or importlib.util.find_spec(requires) is not None
+
+
+def backends_for(fmt):
+    """Return the installed backends for a format, in the order they will be tried."""
+    registered = {b["name"]: b for b in BACKENDS.get(fmt, [])}
+
+    names = _configured_order.get(fmt)
+    if names is None:
+        env_value = os.environ.get(f"EXTRACTION_BACKENDS_{fmt.upper()}", "")
+        names = [n.strip() for n in env_value.split(",") if n.strip()] or None
+
+    if names is None:
+        ordered = list(registered.values())
+    else:
+        ordered = [registered[n] for n in names if n in registered]
+
+    return [b for b in ordered if is_available(b)]
+
+
+def detect_format(filename):
+    ext = filename.rsplit('.', 1)[1].lower() if '.' in filename else ''
+    return FORMAT_BY_EXTENSION.get(ext, "txt")
+
+
+def extract_text(stream, filename):
+    """
+    Extract text from a binary stream, trying each backend for its format.
+
+    Returns "" when every backend fails or finds no text.
+    """
+    fmt = detect_format(filename)
+    for backend in backends_for(fmt):
+        try:
+            stream.seek(0)
+            text = backend["extract"](stream)
+        except Exception as e:
+            print(f"Extraction backend {fmt}/{backend['name']} failed on {filename}: {e}")
+            continue
+        if text and text.strip():
+            return text
+    return ""
+
+
+# --- PDF ---------------------------------------------------------------------
+
+def _pdf_pymupdf(stream):
+    import fitz
+    with fitz.open(stream=stream.read(), filetype="pdf") as doc:
+        return "".join(page.get_text() + "\n" for page in doc)
+
+
+def _pdf_pypdfium2(stream):
+    import pypdfium2
+    pdf = pypdfium2.PdfDocument(stream.read())
+    try:
+        return "".join(page.get_textpage().get_text_range() + "\n" for page in pdf)
+    finally:
+        pdf.close()
+
+
+def _pdf_pypdf(stream):
+    import pypdf
+    reader = pypdf.PdfReader(stream)
+    return "".join((page.extract_text() or "") + "\n" for page in reader.pages)
+
+
+def _pdf_pypdf2(stream):
+    import PyPDF2
+    reader = PyPDF2.PdfReader(stream)
+    return "".join((page.extract_text() or "") + "\n" for page in reader.pages)
+
+
+def _pdf_pdfminer(stream):
+    from pdfminer.high_level import extract_text as pdfminer_extract_text
+    return pdfminer_extract_text(stream)
+
+
+# --- DOCX --------------------------------------------------------------------
+
+def _docx_stream(stream):
+    return docx_extractor.extract_docx_text(stream)
+
+
+def _docx_python_docx(stream):
+    import docx
+    doc = docx.Document(stream)
+    return "".join(para.text + "\n" for para in doc.paragraphs)
+
+
+# --- TXT ---------------------------------------------------------------------
+
+def _txt_utf8(stream):
+    return stream.read().decode('utf-8', errors='ignore')
+
+
+# --- RTF ---------------------------------------------------------------------
+
+def _rtf_striprtf(stream):
+    from striprtf.striprtf import rtf_to_text
+    return rtf_to_text(stream.read().decode('latin-1'))
+
+
+_RTF_DESTINATIONS = re.compile(r'\{\\\*[^{}]*\}|\{\\(?:fonttbl|colortbl|stylesheet|info)[^{}]*(?:\{[^{}]*\}[^{}]*)*\}')
+_RTF_HEX = re.compile(r"\\'([0-9a-fA-F]{2})")
+_RTF_CONTROL = re.compile(r'\\([a-zA-Z]+)(-?\d+)? ?|\\([{}\\])')
+
+
+def _rtf_builtin(stream):
+    """Minimal RTF stripper: drops header groups and control words, keeps paragraph breaks."""
+    raw = stream.read().decode('latin-1')
+    # Source line breaks are not text in RTF, except an escaped one which means \par.
+    raw = raw.replace('\\\r\n', '\\par ').replace('\\\n', '\\par ')
+    raw = re.sub(r'(\\[a-zA-Z]+-?\d*)\r?\n', r'\1 ', raw)
+    raw = raw.replace('\r', '').replace('\n', '')
+    raw = _RTF_DESTINATIONS.sub('', raw)
+    raw = _RTF_HEX.sub(lambda m: bytes([int(m.group(1), 16)]).decode('cp1252', errors='ignore'), raw)
+
+    def replace_control(match):
+        if match.group(3):
+            return match.group(3)
+        word = match.group(1)
+        if word in ('par', 'line', 'row'):
+            return '\n'
+        if word in ('tab', 'cell'):
+            return '\t'
+        return ''
+
+    text = _RTF_CONTROL.sub(replace_control, raw)
+    return text.replace('{', '').replace('}', '')
+
+
+# --- ODT ---------------------------------------------------------------------
+
+_ODF_TEXT_NS = "{urn:oasis:names:tc:opendocument:xmlns:text:1.0}"
+_ODF_TABLE_NS = "{urn:oasis:names:tc:opendocument:xmlns:table:1.0}"
+
+
+def _odt_stream(stream):
+    """Stream paragraphs and headings from content.xml; table cells are tab-joined per row."""
+    lines = []
+    # Open table rows, innermost last; a nested table's rows fold into the enclosing row
+    rows = []
+    with zipfile.ZipFile(stream) as archive:
+        with archive.open("content.xml") as xml_stream:
+            for event, elem in ET.iterparse(xml_stream, events=("start", "end")):
+                if event == "start":
+                    if elem.tag == _ODF_TABLE_NS + "table-row":
+                        rows.append([])
+                    continue
+                if elem.tag in (_ODF_TEXT_NS + "p", _ODF_TEXT_NS + "h"):
+                    line = "".join(elem.itertext())
+                    if rows:
+                        rows[-1].append(line)
+                    else:
+                        lines.append(line)
+                    elem.clear()
+                elif elem.tag == _ODF_TABLE_NS + "table-row":
+                    line = "\t".join(c for c in rows.pop() if c)
+                    if rows:
+                        rows[-1].append(line)
+                    else:
+                        lines.append(line)
+                    elem.clear()
+    return "".join(line + "\n" for line in lines)
+
+
+register_backend("pdf", "pymupdf", _pdf_pymupdf, requires="fitz")
+register_backend("pdf", "pypdfium2", _pdf_pypdfium2, requires="pypdfium2")
+register_backend("pdf", "pypdf", _pdf_pypdf, requires="pypdf")
+register_backend("pdf", "pypdf2", _pdf_pypdf2, requires="PyPDF2")
+register_backend("pdf", "pdfminer", _pdf_pdfminer, requires="pdfminer")
+
+register_backend("docx", "stream", _docx_stream)
+register_backend("docx", "python-docx", _docx_python_docx, requires="docx")
+
+register_backend("txt", "utf8", _txt_utf8)
+
+register_backend("rtf", "striprtf", _rtf_striprtf, requires="striprtf")
+register_backend("rtf", "builtin", _rtf_builtin)
+
+register_backend("odt", "stream", _odt_stream)
@@ -0,0 +1,127 @@
+"""
+Streaming DOCX text extraction.
+
+Reads word/document.xml straight out of the .docx zip with incremental XML
+parsing instead of building python-docx's full object model. Paragraphs and
+table rows are emitted in document order; table cells of a row are joined
+with a tab so skills matrices stay on one line. Text box paragraphs come out
+as their own lines. Memory stays constant because every element is discarded
+as soon as it has been parsed.
+"""
+
+import zipfile
+import xml.etree.ElementTree as ET
+
+W_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+_P = W_NS + "p"
+_PPR = W_NS + "pPr"
+_R = W_NS + "r"
+_T = W_NS + "t"
+_TAB = W_NS + "tab"
+_BR = W_NS + "br"
+_CR = W_NS + "cr"
+_TR = W_NS + "tr"
+_TC = W_NS + "tc"
+_FALLBACK = "{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback"
+
+CELL_SEPARATOR = "\t"
+
+
+def iter_docx_lines(file):
+    """
+    Yield the text of every paragraph and table row of a .docx, in order.
+
+    `file` is a path or a seekable binary file object (e.g. a werkzeug
+    FileStorage). Paragraphs nested inside table cells are folded into the
+    cell text; each table row becomes one line.
+    """
+    with zipfile.ZipFile(file) as archive:
+        with archive.open("word/document.xml") as xml_stream:
+            yield from _iter_document_lines(xml_stream)
+
+
+def extract_docx_text(file):
+    """Return the full text of a .docx, one paragraph or table row per line."""
+    return "".join(line + "\n" for line in iter_docx_lines(file))
+
+
+def _iter_document_lines(xml_stream):
+    # Elements from the root to the one being parsed. Every element is removed
+    # from its parent as soon as it ends, so the tree never holds more than
+    # the current path, however long a table or paragraph gets.
+    path = []
+    # Depth inside an <mc:Fallback> subtree: it repeats its <mc:Choice>
+    # sibling's content (e.g. a text box) in an older format, so it is skipped.
+    skipped = 0
+
+    # Text of each open paragraph, innermost last; runs append to the last
+    # one. Paragraphs nest when a run holds a text box (<w:txbxContent>).
+    paras = []
+    # Open <w:r> and <w:pPr> elements. <w:tab> is a tab character only inside
+    # a run; under <w:pPr><w:tabs> it is a tab-stop definition.
+    runs = 0
+    props = 0
+    # One entry per open table: list of rows, each row a list of cell texts.
+    # Only the innermost open row/cell is ever written to.
+    rows = []
+    cells = []
+
+    for event, elem in ET.iterparse(xml_stream, events=("start", "end")):
+        tag = elem.tag
+        if event == "start":
+            path.append(elem)
+            if skipped or tag == _FALLBACK:
+                skipped += 1
+            elif tag == _P:
+                paras.append([])
+            elif tag == _R:
+                runs += 1
+            elif tag == _PPR:
+                props += 1
+            elif tag == _TR:
+                rows.append([])
+            elif tag == _TC:
+                cells.append([])
+            continue
+
+        # "end" event
+        path.pop()
+        if path:
+            path[-1].remove(elem)
+        if skipped:
+            skipped -= 1
+            continue
+
+        if tag == _T:
+            if elem.text:
+                paras[-1].append(elem.text)
+        elif tag == _R:
+            runs -= 1
+        elif tag == _PPR:
+            props -= 1
+        elif tag == _TAB:
+            if runs and not props:
+                paras[-1].append("\t")
+        elif tag in (_BR, _CR):
+            paras[-1].append("\n")
+        elif tag == _P:
+            # A text box paragraph ends before the paragraph holding it, so
+            # it comes out as its own line just before that one.
+            line = "".join(paras.pop())
+            if cells:
+                cells[-1].append(line)
+            else:
+                yield line
+        elif tag == _TC:
+            cell_lines = cells.pop()
+            cell_text = " ".join(l.strip() for l in cell_lines if l.strip())
+            rows[-1].append(cell_text)
+        elif tag == _TR:
+            row = rows.pop()
+            row_text = CELL_SEPARATOR.join(c for c in row if c)
+            if cells:
+                # Nested table: the row belongs to the enclosing cell.
+                cells[-1].append(row_text)
+            else:
+                yield row_text
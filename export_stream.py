@@ -0,0 +1,186 @@
+"""
+Streaming CSV / XLSX export of SmartTender analyses.
+
+Rows are built from the `analysis` dicts produced by
+smarttender_service (export_summary plus the validation paragraph and the
+rejection email). The writers are generators yielding byte chunks so a web
+response or a file can be produced with constant memory, whatever the number
+of candidates.
+"""
+
+import csv
+import io
+import re
+import zipfile
+from xml.sax.saxutils import escape
+
+EXPORT_COLUMNS = [
+    "candidate_name",
+    "role",
+    "experience",
+    "sector",
+    "skills_matched",
+    "certifications_matched",
+    "overall_status",
+    "validation_paragraph",
+    "rejection_email",
+]
+
+# Spreadsheet apps evaluate cells starting with these as formulas
+_FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+# Rows are buffered and flushed in chunks of roughly this many bytes.
+CHUNK_SIZE = 64 * 1024
+
+CONTENT_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+
+
+def summary_row(analysis):
+    """Flatten one analysis into a dict keyed by EXPORT_COLUMNS."""
+    summary = analysis["export_summary"]
+    return {
+        "candidate_name": summary["candidate_name"],
+        "role": summary["role"],
+        "experience": summary["experience"],
+        "sector": summary["sector"],
+        "skills_matched": "; ".join(summary["skills_matched"]),
+        "certifications_matched": "; ".join(summary["certifications_matched"]),
+        "overall_status": summary["overall_status"],
+        "validation_paragraph": analysis["validation_paragraph"],
+        "rejection_email": analysis["rejection_email"] or "",
+    }
+
+
+def csv_safe(row):
+    """
+    Copy of a row dict with text cells that a spreadsheet would run as a
+    formula prefixed with a quote. Values come from uploaded documents.
+    """
+    return {key: "'" + value if isinstance(value, str) and value.startswith(_FORMULA_PREFIXES) else value
+            for key, value in row.items()}
+
+
+def iter_csv(rows, columns=EXPORT_COLUMNS):
+    """Yield CSV bytes for an iterable of row dicts, header first."""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=columns, extrasaction='ignore')
+    writer.writeheader()
+    for row in rows:
+        writer.writerow(csv_safe(row))
+        if buffer.tell() >= CHUNK_SIZE:
+            yield buffer.getvalue().encode('utf-8')
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue().encode('utf-8')
+
+
+class _ChunkSink:
+    """Write-only, non-seekable file object collecting what zipfile writes."""
+
+    def __init__(self):
+        self.chunks = []
+        self.size = 0
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        self.size += len(data)
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b"".join(self.chunks)
+        self.chunks = []
+        self.size = 0
+        return data
+
+
+_XLSX_STATIC_PARTS = {
+    "[Content_Types].xml": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/worksheets/sheet1.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        '</Types>'
+    ),
+    "_rels/.rels": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="xl/workbook.xml"/>'
+        '</Relationships>'
+    ),
+    "xl/workbook.xml": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+        'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+        '<sheets><sheet name="Export" sheetId="1" r:id="rId1"/></sheets></workbook>'
+    ),
+    "xl/_rels/workbook.xml.rels": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" Target="worksheets/sheet1.xml"/>'
+        '</Relationships>'
+    ),
+}
+
+# Control characters that are not allowed in XML 1.0.
+_ILLEGAL_XML_CHARS = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+
+def _column_letter(index):
+    letters = ""
+    index += 1
+    while index:
+        index, rem = divmod(index - 1, 26)
+        letters = chr(65 + rem) + letters
+    return letters
+
+
+def _xlsx_row(row_number, values, letters):
+    cells = []
+    for letter, value in zip(letters, values):
+        text = escape(_ILLEGAL_XML_CHARS.sub('', str(value)))
+        cells.append(f'<c r="{letter}{row_number}" t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>')
+    return f'<row r="{row_number}">{"".join(cells)}</row>'
+
+
+def iter_xlsx(rows, columns=EXPORT_COLUMNS):
+    """
+    Yield XLSX bytes for an iterable of row dicts.
+
+    The workbook is zipped on the fly into a non-seekable sink (zipfile then
+    uses data descriptors), and the sheet uses inline strings, so no shared
+    string table or full sheet ever has to be held in memory.
+    """
+    letters = [_column_letter(i) for i in range(len(columns))]
+    sink = _ChunkSink()
+    with zipfile.ZipFile(sink, 'w', zipfile.ZIP_DEFLATED) as archive:
+        for name, content in _XLSX_STATIC_PARTS.items():
+            archive.writestr(name, content)
+        yield sink.drain()
+
+        with archive.open("xl/worksheets/sheet1.xml", 'w', force_zip64=True) as sheet:
+            sheet.write(
+                b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                b'<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+            )
+            sheet.write(_xlsx_row(1, columns, letters).encode('utf-8'))
+            for row_number, row in enumerate(rows, start=2):
+                values = [row.get(column, "") for column in columns]
+                sheet.write(_xlsx_row(row_number, values, letters).encode('utf-8'))
+                if sink.size >= CHUNK_SIZE:
+                    yield sink.drain()
+            sheet.write(b'</sheetData></worksheet>')
+    yield sink.drain()
+
+
+WRITERS = {
+    "csv": iter_csv,
+    "xlsx": iter_xlsx,
+}
@@ -1,27 +1,41 @@
 import os
 import json
-from dotenv import load_dotenv
+import importlib.util
 
-load_dotenv()
+# The Groq SDK and python-dotenv are only imported when first needed so that
+# importing this module (and app.py) stays cheap.
+HAS_GROQ = importlib.util.find_spec("groq") is not None
 
-try:
-    from groq import Groq
-    HAS_GROQ = True
-except ImportError:
-    HAS_GROQ = False
-
-GROQ_API_KEY = os.getenv("GROQ_API_KEY")
 MODEL = "llama3-70b-8192"
 
+_env_loaded = False
+
+def load_env():
+    """Load .env into os.environ once."""
+    global _env_loaded
+    if not _env_loaded:
+        from dotenv import load_dotenv
+        load_dotenv()
+        _env_loaded = True
+
+def get_api_key():
+    load_env()
+    return os.getenv("GROQ_API_KEY")
+
 def is_llm_configured():
-    return bool(HAS_GROQ and GROQ_API_KEY and GROQ_API_KEY != "PASTE_YOUR_GROQ_API_KEY_HERE")
+    api_key = get_api_key()
+    return bool(HAS_GROQ and api_key and api_key != "PASTE_YOUR_GROQ_API_KEY_HERE")
+
+def _get_client():
+    from groq import Groq
+    return Groq(api_key=get_api_key())
 
 def extract_tender_requirements(tender_text):
     """Extract structured requirements from tender document using Groq."""
     if not is_llm_configured():
         raise ValueError("GROQ_API_KEY is not configured.")
     
-    client = Groq(api_key=GROQ_API_KEY)
+    client = _get_client()
     
     prompt = f"""Extract structured requirements from the following tender document.
 Return ONLY valid JSON with no additional text or markdown formatting.
@@ -47,14 +61,14 @@ Rules:
 - Do NOT invent or assume information"""
 
     print("Calling Groq: Extract Tender Requirements...")
-    message = client.messages.create(
+    message = client.chat.completions.create(
         model=MODEL,
         max_tokens=1024,
         messages=[{"role": "user", "content": prompt}]
     )
     
     try:
-        text = message.content[0].text.strip()
+        text = message.choices[0].message.content.strip()
         # Strip markdown code fences if present
         if text.startswith("```json"):
             text = text[7:]
@@ -74,7 +88,7 @@ Rules:
             "constraints": []
         }
     except Exception as e:
-        raw_text = message.content[0].text if message.content else 'No response text'
+        raw_text = message.choices[0].message.content if message.choices else 'No response text'
         with open('llm_error.log', 'w', encoding='utf-8') as f:
             f.write(f"ERROR: {e}\n\nTEXT:\n{raw_text}")
         print(f"Failed to parse Groq JSON: {e}")
@@ -85,7 +99,7 @@ def generate_justification_paragraph(tender_reqs, candidate_profile, matching_ex
     if not is_llm_configured():
         raise ValueError("GROQ_API_KEY is not configured.")
     
-    client = Groq(api_key=GROQ_API_KEY)
+    client = _get_client()
     
     prompt = f"""Generate a short professional justification paragraph (max 5 lines) explaining why this consultant is suitable for the tender.
 
@@ -115,17 +129,17 @@ Rules:
 - No marketing language"""
 
     print("Calling Groq: Generate Justification...")
-    message = client.messages.create(
+    message = client.chat.completions.create(
         model=MODEL,
         max_tokens=512,
         messages=[{"role": "user", "content": prompt}]
     )
     
     try:
-        text = message.content[0].text.strip()
+        text = message.choices[0].message.content.strip()
         return text
     except Exception as e:
-        raw_text = message.content[0].text if message.content else 'No response text'
+        raw_text = message.choices[0].message.content if message.choices else 'No response text'
         with open('llm_error.log', 'w', encoding='utf-8') as f:
             f.write(f"ERROR in generate_justification: {e}\n\nTEXT:\n{raw_text}")
         print(f"Failed to generate justification: {e}")
@@ -0,0 +1,97 @@
+"""
+Size and time budgets for the regex-based document parsers.
+
+A ParseBudget is created per document. `clip()` cuts the text to
+PARSE_MAX_CHARS before any regex sees it, and the parsers call `expired()`
+between fields: once the time budget is spent the remaining fields keep
+their "Not specified" defaults. Either way the budget reports `exceeded`, so
+callers can flag the result as partial instead of pinning a worker on one
+hostile document.
+
+`match_after_label` is the linear-time replacement for the old
+`{label}...(.*?)(?=...)` DOTALL patterns: the label is escaped and searched
+on its own, and the section body is matched in a bounded window after it.
+"""
+
+import os
+import re
+import time
+
+MAX_DOCUMENT_CHARS = int(os.environ.get("PARSE_MAX_CHARS", 500_000))
+TIME_BUDGET_SECONDS = float(os.environ.get("PARSE_TIME_BUDGET_SECONDS", 0.5))
+
+# Longest section body captured after a label
+MAX_SECTION_CHARS = 5_000
+
+
+class ParseBudget:
+    def __init__(self, max_chars=None, seconds=None):
+        self.max_chars = MAX_DOCUMENT_CHARS if max_chars is None else max_chars
+        self.seconds = TIME_BUDGET_SECONDS if seconds is None else seconds
+        self.deadline = time.monotonic() + self.seconds
+        self.truncated = False
+        self.timed_out = False
+
+    def clip(self, text):
+        if len(text) > self.max_chars:
+            self.truncated = True
+            return text[:self.max_chars]
+        return text
+
+    def expired(self):
+        if not self.timed_out and time.monotonic() > self.deadline:
+            self.timed_out = True
+        return self.timed_out
+
+    @property
+    def exceeded(self):
+        return self.truncated or self.timed_out
+
+    def warnings(self, document):
+        messages = []
+        if self.truncated:
+            messages.append(f"{document} truncated to {self.max_chars} characters before parsing")
+        if self.timed_out:
+            messages.append(f"{document} parsing stopped after the {self.seconds}s time budget")
+        return messages
+
+
+def label_pattern(label, suffix=''):
+    """Case-insensitive regex for a literal label (escaped), e.g. 'C++' or 'Skills'."""
+    return re.compile(re.escape(label) + suffix, re.IGNORECASE)
+
+
+def match_after_label(label_regex, body_regex, text, window=MAX_SECTION_CHARS):
+    """
+    Match `body_regex` right after the first occurrence of `label_regex` where
+    it matches, looking at most `window` characters ahead (`$` matches the
+    window end). Same result as searching for label + body in one pattern, but
+    each attempt is bounded, so a document full of labels stays linear.
+    """
+    for label_match in label_regex.finditer(text):
+        start = label_match.end()
+        match = body_regex.match(text, start, start + window)
+        if match:
+            return match
+    return None
+
+
+def bullet_block(lines, lowered_lines, label):
+    """
+    Bullet items ('-', '*', '•') on the lines following the first line that
+    contains `label` and is directly followed by bullets. Lines are scanned
+    once, so the cost is linear in the document size.
+    """
+    label = label.lower()
+    for i, line in enumerate(lowered_lines):
+        if label not in line:
+            continue
+        items = []
+        j = i + 1
+        # Like the original pattern, a bullet line only counts when newline-terminated
+        while j < len(lines) - 1 and lines[j].lstrip(" \t")[:1] in ('-', '*', '•'):
+            items.append(lines[j].lstrip(" \t")[1:].strip())
+            j += 1
+        if items:
+            return items
+    return []
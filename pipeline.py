@@ -0,0 +1,204 @@
+"""
+Chunked process-pool execution of the per-CV stages.
+
+Parsing an uploaded CV (text extraction, both regex parsers, MinHash
+signature) and matching it against the tender are pure CPU work on one item
+at a time. `map_ordered` splits the items into chunks, runs the chunks on a
+shared ProcessPoolExecutor and returns the results in input order. The output
+is therefore identical to the serial loop, and everything merged afterwards
+(dedup clusters, ranking) is deterministic.
+
+Items are consumed lazily: only a bounded window of chunks is in flight, so
+a generator of large uploads is never held in memory all at once.
+
+Small batches run serially, because shipping a handful of items to other
+processes costs more than it saves. So do single-worker configurations.
+
+Tuning (process environment; these are read at import time, before .env is
+loaded, so they have no effect in .env):
+    PIPELINE_WORKERS      worker processes per web process (default: CPU
+                          count, at most 4; 1 = serial). Under gunicorn or
+                          several web processes, keep workers x web
+                          processes close to the number of cores.
+    PIPELINE_CHUNK_SIZE   items per task sent to a worker (default 32)
+    PIPELINE_MIN_ITEMS    smallest batch worth parallelizing (default 64)
+
+Workers are started with "forkserver" (or "spawn" where it does not exist),
+never by forking the threaded web process, so the pool can safely be created
+lazily from a request thread. Workers import the stage functions' module
+themselves; it should check `in_worker()` before doing start-up work that
+only the web process needs. Stage functions must be module-level functions
+(or functools.partial of one) and must only take and return plain data:
+worker processes do not share the parent's vocabulary or stored documents.
+
+If a worker process dies (crash, OOM kill), the chunks that were in flight
+are re-run one item at a time in a separate process to find the item that
+killed it; that item's result comes from `on_crash`, and the rest of the
+batch continues on a fresh pool.
+"""
+
+import itertools
+import multiprocessing
+import os
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+DEFAULT_WORKERS = int(os.environ.get("PIPELINE_WORKERS", 0)) or min(4, os.cpu_count() or 1)
+DEFAULT_CHUNK_SIZE = int(os.environ.get("PIPELINE_CHUNK_SIZE", 32))
+MIN_PARALLEL_ITEMS = int(os.environ.get("PIPELINE_MIN_ITEMS", 64))
+
+# Chunks in flight per worker
+_WINDOW = 2
+
+_executors = {}
+_lock = threading.Lock()
+
+
+class WorkerCrashed(Exception):
+    """A worker process died while running a stage function on `item`."""
+
+    def __init__(self, item):
+        super().__init__("A pipeline worker process died while processing an item")
+        self.item = item
+
+
+def _context():
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context("forkserver")
+        # Do not run the web process's __main__ in the fork server
+        context.set_forkserver_preload([])
+        return context
+    return multiprocessing.get_context("spawn")
+
+
+def in_worker():
+    """True inside a pipeline worker process (including while it imports modules)."""
+    return multiprocessing.current_process().name != "MainProcess"
+
+
+def _executor(workers):
+    with _lock:
+        executor = _executors.get(workers)
+        if executor is None:
+            executor = _executors[workers] = ProcessPoolExecutor(max_workers=workers, mp_context=_context())
+        return executor
+
+
+def _discard_executor(workers):
+    with _lock:
+        executor = _executors.pop(workers, None)
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def shutdown():
+    """Stop every worker pool (they are restarted on the next parallel call)."""
+    with _lock:
+        executors = list(_executors.values())
+        _executors.clear()
+    for executor in executors:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def _run_chunk(func, chunk):
+    return [func(item) for item in chunk]
+
+
+def _chunked(items, chunk_size):
+    while True:
+        chunk = list(itertools.islice(items, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def map_ordered(func, items, workers=None, chunk_size=None, min_items=None, check=None, on_crash=None):
+    """
+    [func(item) for item in items], computed in chunks on worker processes.
+
+    `check` is called after every chunk (e.g. admission.check_deadline) and
+    may raise to abandon the remaining chunks. `on_crash(item)` gives the
+    result of an item whose worker process died; without it, WorkerCrashed
+    is raised.
+    """
+    workers = DEFAULT_WORKERS if workers is None else workers
+    chunk_size = max(1, chunk_size or DEFAULT_CHUNK_SIZE)
+    min_items = MIN_PARALLEL_ITEMS if min_items is None else min_items
+
+    # Worth parallelizing: at least min_items items and more than one chunk
+    items = iter(items)
+    threshold = max(min_items, chunk_size + 1)
+    head = list(itertools.islice(items, threshold)) if workers > 1 else []
+    chunks = _chunked(itertools.chain(head, items), chunk_size)
+
+    if workers <= 1 or len(head) < threshold:
+        results = []
+        for chunk in chunks:
+            results.extend(_run_chunk(func, chunk))
+            if check:
+                check()
+        return results
+    return _run_parallel(func, chunks, workers, check, on_crash)
+
+
+def _run_parallel(func, chunks, workers, check, on_crash):
+    results = []
+    in_flight = deque()  # chunks submitted and not yet collected, in order
+    futures = deque()
+
+    def collect():
+        results.extend(futures[0].result())
+        futures.popleft()
+        in_flight.popleft()
+        if check:
+            check()
+
+    while True:
+        try:
+            executor = _executor(workers)
+            for chunk in chunks:
+                in_flight.append(chunk)
+                futures.append(executor.submit(_run_chunk, func, chunk))
+                if len(futures) >= workers * _WINDOW:
+                    collect()
+            while futures:
+                collect()
+            return results
+        except BrokenProcessPool:
+            # The item that killed the worker is in one of the chunks in flight
+            print("Pipeline worker process died; isolating the items in flight")
+            _discard_executor(workers)
+            suspects = [item for chunk in in_flight for item in chunk]
+            in_flight.clear()
+            futures.clear()
+            results.extend(_run_isolated(func, suspects, check, on_crash))
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            raise
+
+
+def _run_isolated(func, items, check, on_crash):
+    """Run items one at a time in a single worker process, so a crash is pinned on its item."""
+    results = []
+    executor = None
+    try:
+        for item in items:
+            if executor is None:
+                executor = ProcessPoolExecutor(max_workers=1, mp_context=_context())
+            try:
+                results.append(executor.submit(func, item).result())
+            except BrokenProcessPool:
+                executor.shutdown(wait=False)
+                executor = None
+                if on_crash is None:
+                    raise WorkerCrashed(item)
+                results.append(on_crash(item))
+            if check:
+                check()
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+    return results
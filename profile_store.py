@@ -0,0 +1,136 @@
+"""
+Compact in-memory representation of parsed CVs.
+
+A bench of tens of thousands of consultants repeats the same few hundred
+skill, certification and sector strings over and over. CompactProfile keeps
+each parsed CV in a __slots__ object where those lists are arrays of integer
+ids into one shared Vocabulary, and the raw CV text is not kept at all.
+
+`profile_dict()` and `candidate_dict()` rebuild the exact dict shapes of
+app.parse_candidate_profile and smarttender_service.extract_cv_data, so the
+JSON produced from them is unchanged.
+"""
+
+import sys
+import threading
+from array import array
+
+
+class Vocabulary:
+    """Bidirectional string <-> integer id table."""
+
+    def __init__(self):
+        self._ids = {}
+        self._strings = []
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._strings)
+
+    def intern(self, value):
+        string_id = self._ids.get(value)
+        if string_id is None:
+            with self._lock:
+                string_id = self._ids.get(value)
+                if string_id is None:
+                    string_id = len(self._strings)
+                    value = sys.intern(value)
+                    self._strings.append(value)
+                    self._ids[value] = string_id
+        return string_id
+
+    def lookup(self, string_id):
+        return self._strings[string_id]
+
+    def get_id(self, value):
+        """Id of `value`, or None if it has never been interned."""
+        return self._ids.get(value)
+
+    def encode(self, values):
+        return array('I', [self.intern(v) for v in values])
+
+    def decode(self, ids):
+        strings = self._strings
+        return [strings[i] for i in ids]
+
+    def strings(self):
+        return list(self._strings)
+
+
+# Shared by every profile of the process
+VOCABULARY = Vocabulary()
+
+
+class CompactProfile:
+    """One parsed CV: both parser outputs, with string lists stored as vocabulary ids."""
+
+    __slots__ = (
+        "filename",
+        "signature",   # cv_dedup MinHash signature
+        "duplicates",  # filenames of older near-identical CVs this one represents
+        "partial_parse",  # the parsers hit their size cap or time budget
+        # app.parse_candidate_profile
+        "name",
+        "experience_years",
+        "skills",
+        "certifications",
+        "sector_experience",
+        # smarttender_service.extract_cv_data
+        "full_name",
+        "candidate_experience_years",
+        "candidate_skills",
+        "candidate_certifications",
+        "candidate_sector",
+    )
+
+    vocabulary = VOCABULARY
+
+    @classmethod
+    def from_parsed(cls, filename, profile, candidate, signature=None, partial_parse=False):
+        """Build from a parse_candidate_profile dict and an extract_cv_data "candidate" dict."""
+        vocab = cls.vocabulary
+        self = cls()
+        self.filename = filename
+        self.signature = signature
+        self.duplicates = ()
+        self.partial_parse = partial_parse
+        self.name = profile["name"]
+        self.experience_years = sys.intern(profile["experience_years"])
+        self.skills = vocab.encode(profile["skills"])
+        self.certifications = vocab.encode(profile["certifications"])
+        self.sector_experience = vocab.encode(profile["sector_experience"])
+        self.full_name = candidate["full_name"]
+        self.candidate_experience_years = candidate["experience_years"]
+        self.candidate_skills = vocab.encode(candidate["skills"])
+        self.candidate_certifications = vocab.encode(candidate["certifications"])
+        self.candidate_sector = vocab.intern(candidate["sector"])
+        return self
+
+    def identity(self):
+        """Normalized candidate name (extract_cv_data), or None when the CV states none."""
+        name = " ".join(self.full_name.split()).casefold()
+        return None if not name or name == "not specified" else name
+
+    def profile_dict(self):
+        """Same shape as app.parse_candidate_profile."""
+        vocab = self.vocabulary
+        return {
+            "name": self.name,
+            "skills": vocab.decode(self.skills),
+            "experience_years": self.experience_years,
+            "certifications": vocab.decode(self.certifications),
+            "sector_experience": vocab.decode(self.sector_experience)
+        }
+
+    def candidate_dict(self):
+        """Same shape as smarttender_service.extract_cv_data."""
+        vocab = self.vocabulary
+        return {
+            "candidate": {
+                "full_name": self.full_name,
+                "experience_years": self.candidate_experience_years,
+                "skills": vocab.decode(self.candidate_skills),
+                "certifications": vocab.decode(self.candidate_certifications),
+                "sector": vocab.lookup(self.candidate_sector)
+            }
+        }
@@ -0,0 +1,222 @@
+"""
+Opt-in CPU profiling of individual production requests.
+
+Disabled unless PROFILE_DIR is set; when it is not, `init_app` registers
+nothing and requests pay no cost at all. When enabled, a request is profiled
+if any of these triggers applies:
+
+- PROFILE_ALLOW_HEADER=1 and the request carries `X-Profile: 1`
+  -> full cProfile of the request (.prof, readable with pstats/snakeviz)
+- PROFILE_SAMPLE_RATE=<0..1> and the request is randomly sampled
+  -> full cProfile of the request
+- PROFILE_SLOW_MS=<ms> and the request is still running after that long
+  -> stack sampling from that point on (.collapsed, flamegraph format), so
+     fast requests are never slowed down by a profiler
+
+cProfile is process-wide, so only one request is cProfiled at a time; a
+request triggered while another is being profiled falls back to stack
+sampling (if PROFILE_SLOW_MS is set) or is not profiled.
+
+Each profile is written next to a .json file with request metadata. Uploaded
+documents and text fields are recorded only as SHA-256 hashes and sizes, so
+confidential content never reaches the profile directory.
+"""
+
+import hashlib
+import json
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+
+from flask import g, request
+
+
+def init_app(app, context=None):
+    """
+    Enable request profiling on `app` if PROFILE_DIR is set.
+
+    `context` is an optional callable returning extra metadata (already
+    hashed) for the current request, e.g. hashes of stored documents.
+    """
+    directory = os.environ.get("PROFILE_DIR")
+    if not directory:
+        return None
+    profiler = RequestProfiler(
+        directory,
+        allow_header=os.environ.get("PROFILE_ALLOW_HEADER") == "1",
+        sample_rate=float(os.environ.get("PROFILE_SAMPLE_RATE", "0")),
+        slow_ms=float(os.environ.get("PROFILE_SLOW_MS", "0")),
+        context=context,
+    )
+    app.before_request(profiler.before_request)
+    app.teardown_request(profiler.teardown_request)
+    return profiler
+
+
+def content_hash(data):
+    if isinstance(data, str):
+        data = data.encode("utf-8", errors="ignore")
+    return {"sha256": hashlib.sha256(data).hexdigest(), "size": len(data)}
+
+
+class StackSampler:
+    """
+    One daemon thread sampling the stacks of requests that outlive `slow_ms`.
+
+    Requests only register their thread id and start time; the sampler wakes
+    every `interval` seconds and records the collapsed stack of each request
+    older than the threshold.
+    """
+
+    def __init__(self, slow_ms, interval=0.005):
+        self.threshold = slow_ms / 1000
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._active = {}   # thread id -> start time
+        self._samples = {}  # thread id -> Counter of collapsed stacks
+        thread = threading.Thread(target=self._run, name="request-stack-sampler", daemon=True)
+        thread.start()
+
+    def register(self):
+        with self._lock:
+            self._active[threading.get_ident()] = time.monotonic()
+
+    def unregister(self):
+        """Stop sampling the current thread and return its samples (possibly empty)."""
+        ident = threading.get_ident()
+        with self._lock:
+            self._active.pop(ident, None)
+            return self._samples.pop(ident, Counter())
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            now = time.monotonic()
+            with self._lock:
+                due = [ident for ident, started in self._active.items() if now - started >= self.threshold]
+            if not due:
+                continue
+            frames = sys._current_frames()
+            with self._lock:
+                for ident in due:
+                    frame = frames.get(ident)
+                    if frame is None or ident not in self._active:
+                        continue
+                    self._samples.setdefault(ident, Counter())[_collapse(frame)] += 1
+
+
+def _collapse(frame):
+    stack = []
+    while frame is not None:
+        code = frame.f_code
+        stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+        frame = frame.f_back
+    return ";".join(reversed(stack))
+
+
+class RequestProfiler:
+    def __init__(self, directory, allow_header=False, sample_rate=0.0, slow_ms=0.0, context=None):
+        self.directory = directory
+        self.allow_header = allow_header
+        self.sample_rate = sample_rate
+        self.context = context
+        self.sampler = StackSampler(slow_ms) if slow_ms > 0 else None
+        self._cprofile_lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def before_request(self):
+        g.profile_started = time.monotonic()
+        trigger = None
+        if self.allow_header and request.headers.get("X-Profile") == "1":
+            trigger = "header"
+        elif self.sample_rate > 0 and random.random() < self.sample_rate:
+            trigger = "sample"
+
+        if trigger and self._cprofile_lock.acquire(blocking=False):
+            # Imported here: nothing profiling-related is loaded while PROFILE_DIR is unset
+            import cProfile
+            profile = cProfile.Profile()
+            try:
+                profile.enable()
+            except ValueError:
+                # Another profiling tool (e.g. a debugger) owns the profiling hooks
+                self._cprofile_lock.release()
+            else:
+                g.profile_trigger = trigger
+                g.profile = profile
+                return
+        if self.sampler:
+            self.sampler.register()
+
+    def teardown_request(self, exc=None):
+        started = g.pop("profile_started", None)
+        if started is None:
+            return
+        duration_ms = (time.monotonic() - started) * 1000
+
+        profile = g.pop("profile", None)
+        if profile is not None:
+            try:
+                profile.disable()
+            finally:
+                self._cprofile_lock.release()
+            self._write(g.pop("profile_trigger"), duration_ms, exc, profile=profile)
+        elif self.sampler:
+            samples = self.sampler.unregister()
+            if samples:
+                self._write("slow", duration_ms, exc, samples=samples)
+
+    def _metadata(self, trigger, duration_ms, exc):
+        documents = {}
+        for field, storage in request.files.items(multi=True):
+            stream = storage.stream
+            try:
+                stream.seek(0)
+                digest = content_hash(stream.read())
+                stream.seek(0)
+            except (OSError, ValueError):
+                continue
+            digest["extension"] = storage.filename.rsplit('.', 1)[-1].lower() if storage.filename and '.' in storage.filename else ""
+            documents.setdefault(field, []).append(digest)
+
+        body = request.get_json(silent=True) if request.is_json else None
+        if isinstance(body, dict):
+            for key, value in body.items():
+                if isinstance(value, str):
+                    documents[key] = content_hash(value)
+
+        metadata = {
+            "trigger": trigger,
+            "method": request.method,
+            "endpoint": request.endpoint,
+            "path": request.path,
+            "duration_ms": round(duration_ms, 1),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime()),
+            "error": type(exc).__name__ if exc else None,
+            "documents": documents,
+        }
+        if self.context:
+            try:
+                metadata["context"] = self.context()
+            except Exception as e:
+                metadata["context_error"] = str(e)
+        return metadata
+
+    def _write(self, trigger, duration_ms, exc, profile=None, samples=None):
+        try:
+            name = f"{time.strftime('%Y%m%d-%H%M%S')}_{request.endpoint or 'unknown'}_{uuid.uuid4().hex[:8]}"
+            base = os.path.join(self.directory, name)
+            if profile is not None:
+                profile.dump_stats(base + ".prof")
+            else:
+                with open(base + ".collapsed", "w", encoding="utf-8") as f:
+                    for stack, count in samples.most_common():
+                        f.write(f"{stack} {count}\n")
+            with open(base + ".json", "w", encoding="utf-8") as f:
+                json.dump(self._metadata(trigger, duration_ms, exc), f, indent=2)
+        except Exception as e:
+            print(f"Failed to write request profile: {e}")
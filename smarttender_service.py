@@ -19,11 +19,33 @@ ABSOLUTE RULES:
 import re
 import json
 
+from parse_budget import ParseBudget, bullet_block, label_pattern, match_after_label
 
-def extract_tender_requirements(tender_text):
+
+# Patterns are written so that no input can make them backtrack
+# super-linearly: digit runs are anchored with (?<!\d), optional pieces do not
+# overlap, and section bodies are matched in a bounded window after the label
+# (see parse_budget.match_after_label).
+_FIELD_BODY = re.compile(r'[\s:]*(.*?)(?=\n[A-Z]|\n\n|$)', re.IGNORECASE | re.DOTALL)
+_SECTION_BODY = re.compile(r'[\s:]*(.*?)(?=\n[A-Z][a-z]+[\s:]|\n\n|$)', re.IGNORECASE | re.DOTALL)
+_TENDER_YEARS = [
+    re.compile(r'minimum\s+(?:of\s+)?(\d+)\s+years?', re.IGNORECASE),
+    re.compile(r'(?<!\d)(\d+)\s*(?:\+\s*)?years?', re.IGNORECASE),
+    re.compile(r'experience[\s:]*(\d+)\s+years?', re.IGNORECASE),
+]
+_CV_YEARS = [
+    re.compile(r'(?<!\d)(\d+)\s*(?:\+\s*)?years?', re.IGNORECASE),
+    re.compile(r'experience[\s:]*(\d+)\s+years?', re.IGNORECASE),
+]
+
+
+def extract_tender_requirements(tender_text, budget=None):
     """
     STEP 1: Extract tender requirements from tender document.
     
+    The text is parsed under a ParseBudget (size cap + time budget); pass one
+    in to read its `exceeded` flag afterwards.
+    
     Returns:
     {
       "tender": {
@@ -36,13 +58,18 @@ def extract_tender_requirements(tender_text):
     }
     """
     
+    if budget is None:
+        budget = ParseBudget()
+    text = budget.clip(tender_text)
+    lines = text.split('\n')
+    lowered_lines = [line.lower() for line in lines]
+    
     def extract_field(label, text):
         """Extract field value by label. Supports alternation with |"""
         labels_list = label.split('|')
         
         for single_label in labels_list:
-            pattern = rf'{single_label}[\s:]*\n*(.*?)(?=\n[A-Z]|\n\n|$)'
-            match = re.search(pattern, text, re.IGNORECASE | re.DOTALL)
+            match = match_after_label(label_pattern(single_label), _FIELD_BODY, text)
             if match and match.group(1):
                 result = match.group(1).replace('\n', ' ').strip()
                 if result:
@@ -59,13 +86,9 @@ def extract_tender_requirements(tender_text):
         # Try bullet points first
         labels_list = label.split('|')
         for single_label in labels_list:
-            bullet_pattern = rf'{single_label}.*?\n((?:[ \t]*[-*•].*?\n)+)'
-            bullet_match = re.search(bullet_pattern, text, re.IGNORECASE)
-            if bullet_match:
-                items = re.findall(r'[-*•]\s*(.*?)(?:\n|$)', bullet_match.group(1))
-                result = [i.strip() for i in items if i.strip()]
-                if result:
-                    return result
+            result = [i for i in bullet_block(lines, lowered_lines, single_label) if i]
+            if result:
+                return result
         
         # Try comma-separated
         if ',' in val:
@@ -76,13 +99,8 @@ def extract_tender_requirements(tender_text):
     
     def extract_years(text):
         """Extract minimum years required."""
-        patterns = [
-            r'minimum\s+(?:of\s+)?(\d+)\s+years?',
-            r'(\d+)\s*\+?\s*years?(?:\s+(?:of|experience))?',
-            r'experience[\s:]*(\d+)\s+years?'
-        ]
-        for pattern in patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        for pattern in _TENDER_YEARS:
+            match = pattern.search(text)
             if match:
                 try:
                     return int(match.group(1))
@@ -90,12 +108,12 @@ def extract_tender_requirements(tender_text):
                     pass
         return 0
     
-    # Extract all fields
-    role = extract_field("Role|Title|Position", tender_text)
-    required_skills = extract_list("Skills|Requirements|Qualifications", tender_text)
-    minimum_experience = extract_years(tender_text)
-    required_certs = extract_list("Certifications|Licenses", tender_text)
-    sector = extract_field("Sector|Industry|Vertical", tender_text)
+    # Extract all fields; once the time budget is spent the rest stay unspecified
+    role = extract_field("Role|Title|Position", text) if not budget.expired() else "Not specified"
+    required_skills = extract_list("Skills|Requirements|Qualifications", text) if not budget.expired() else []
+    minimum_experience = extract_years(text) if not budget.expired() else 0
+    required_certs = extract_list("Certifications|Licenses", text) if not budget.expired() else []
+    sector = extract_field("Sector|Industry|Vertical", text) if not budget.expired() else "Not specified"
     
     return {
         "tender": {
@@ -108,10 +126,12 @@ def extract_tender_requirements(tender_text):
     }
 
 
-def extract_cv_data(cv_text, filename="CV"):
+def extract_cv_data(cv_text, filename="CV", budget=None):
     """
     STEP 2: Extract CV data from CV document.
     
+    Parsed under a ParseBudget like extract_tender_requirements.
+    
     Returns:
     {
       "candidate": {
@@ -124,6 +144,10 @@ def extract_cv_data(cv_text, filename="CV"):
     }
     """
     
+    if budget is None:
+        budget = ParseBudget()
+    cv_text = budget.clip(cv_text)
+    
     def extract_name():
         """Extract candidate name from first non-empty line."""
         lines = [line.strip() for line in cv_text.split('\n') if line.strip()]
@@ -156,8 +180,7 @@ def extract_cv_data(cv_text, filename="CV"):
             labels = list(labels)
         
         for label in labels:
-            pattern = rf'{label}s?[\s:]*\n*(.*?)(?=\n[A-Z][a-z]+[\s:]|\n\n|$)'
-            match = re.search(pattern, cv_text, re.IGNORECASE | re.DOTALL)
+            match = match_after_label(label_pattern(label, 's?'), _SECTION_BODY, cv_text)
             if match and match.group(1):
                 content = match.group(1).replace('\n', ', ')
                 if content.strip():
@@ -176,12 +199,8 @@ def extract_cv_data(cv_text, filename="CV"):
     
     def extract_years():
         """Extract total years of experience."""
-        patterns = [
-            r'(\d+)\s*\+?\s*years?(?:\s+(?:of|professional|experience))?',
-            r'experience[\s:]*(\d+)\s+years?'
-        ]
-        for pattern in patterns:
-            match = re.search(pattern, cv_text, re.IGNORECASE)
+        for pattern in _CV_YEARS:
+            match = pattern.search(cv_text)
             if match:
                 try:
                     return int(match.group(1))
@@ -189,12 +208,12 @@ def extract_cv_data(cv_text, filename="CV"):
                     pass
         return 0
     
-    # Extract all fields
+    # Extract all fields; once the time budget is spent the rest stay unspecified
     full_name = extract_name()
-    experience_years = extract_years()
-    skills = extract_section_list(['Skills', 'Technical Skills', 'Core Competencies', 'Expertise'])
-    certifications = extract_section_list(['Certifications', 'Licenses', 'Education', 'Qualifications'])
-    sector = extract_section(['Sector', 'Industry', 'Domain', 'Specialization']) or "Not specified"
+    experience_years = extract_years() if not budget.expired() else 0
+    skills = extract_section_list(['Skills', 'Technical Skills', 'Core Competencies', 'Expertise']) if not budget.expired() else []
+    certifications = extract_section_list(['Certifications', 'Licenses', 'Education', 'Qualifications']) if not budget.expired() else []
+    sector = (extract_section(['Sector', 'Industry', 'Domain', 'Specialization']) if not budget.expired() else "") or "Not specified"
     
     return {
         "candidate": {
@@ -444,6 +463,78 @@ def generate_export_summary(tender_data, candidate_data, matching_data):
     }
 
 
+def analyze_candidate(tender_data, cv_text, cv_filename="CV", budget=None):
+    """
+    Run steps 2-6 for one CV against already extracted tender requirements.
+    
+    Returns the combined analysis dict (same shape as run_full_analysis's "analysis").
+    """
+    
+    # Step 2: Extract CV data
+    candidate_data = extract_cv_data(cv_text, cv_filename, budget)
+    
+    return analyze_parsed_candidate(tender_data, candidate_data)
+
+
+def analyze_parsed_candidate(tender_data, candidate_data):
+    """
+    Run steps 3-6 for an already extracted CV (output of extract_cv_data).
+    """
+    
+    # Step 3: Matching analysis
+    matching_data = analyze_matching(tender_data, candidate_data)
+    
+    # Step 4: Validation paragraph
+    validation_paragraph = generate_validation_paragraph(tender_data, candidate_data, matching_data)
+    
+    # Step 5: Rejection email (only if not suitable)
+    rejection_email = generate_rejection_email(tender_data, candidate_data, matching_data)
+    
+    # Step 6: Export summary
+    export_summary = generate_export_summary(tender_data, candidate_data, matching_data)
+    
+    # Combine all outputs
+    return {
+        **tender_data,
+        **candidate_data,
+        **matching_data,
+        "validation_paragraph": validation_paragraph,
+        "rejection_email": rejection_email,
+        **export_summary
+    }
+
+
+def iter_batch_analysis(tender_text, candidates):
+    """
+    Analyze many already extracted CVs against one tender, lazily.
+    
+    Input:
+    - tender_text: Extracted tender document text
+    - candidates: Iterable of (cv_filename, candidate_data) pairs, candidate_data
+      being the output of extract_cv_data
+    
+    Yields (cv_filename, result) one CV at a time; the tender is extracted once.
+    result has run_full_analysis's shape: {"status": "success", "analysis": ...}
+    or {"status": "error", "error": ...}. A CV that fails does not stop the
+    iteration, so a streamed export is never cut short.
+    """
+    
+    try:
+        tender_data = extract_tender_requirements(tender_text)
+        tender_error = None
+    except Exception as e:
+        tender_data, tender_error = None, f"Tender: {e}"
+    
+    for cv_filename, candidate_data in candidates:
+        if tender_error:
+            yield cv_filename, {"status": "error", "error": tender_error}
+            continue
+        try:
+            yield cv_filename, {"status": "success", "analysis": analyze_parsed_candidate(tender_data, candidate_data)}
+        except Exception as e:
+            yield cv_filename, {"status": "error", "error": str(e)}
+
+
 def run_full_analysis(tender_text, cv_text, cv_filename="CV"):
     """
     RUN COMPLETE 6-STEP ANALYSIS.
@@ -453,39 +544,45 @@ def run_full_analysis(tender_text, cv_text, cv_filename="CV"):
     - cv_text: Extracted CV document text
     - cv_filename: Filename of CV (for reference only)
     
-    Output: Complete analysis package with all 6 steps
+    Output: Complete analysis package with all 6 steps. "partial_parse" is
+    true when either document hit its size cap or time budget, in which case
+    "parse_warnings" says which.
     """
     
     try:
-        # Step 1: Extract tender requirements
-        tender_data = extract_tender_requirements(tender_text)
-        
-        # Step 2: Extract CV data
-        candidate_data = extract_cv_data(cv_text, cv_filename)
+        tender_budget = ParseBudget()
         
-        # Step 3: Matching analysis
-        matching_data = analyze_matching(tender_data, candidate_data)
-        
-        # Step 4: Validation paragraph
-        validation_paragraph = generate_validation_paragraph(tender_data, candidate_data, matching_data)
-        
-        # Step 5: Rejection email (only if not suitable)
-        rejection_email = generate_rejection_email(tender_data, candidate_data, matching_data)
+        # Step 1: Extract tender requirements
+        tender_data = extract_tender_requirements(tender_text, tender_budget)
+    
+    except Exception as e:
+        return {
+            "status": "error",
+            "error": str(e)
+        }
+    
+    return run_tender_analysis(tender_data, tender_budget, cv_text, cv_filename)
+
+
+def run_tender_analysis(tender_data, tender_budget, cv_text, cv_filename="CV"):
+    """
+    Steps 2-6 of run_full_analysis, for a tender already extracted with
+    `tender_budget` (so one tender can be analyzed against many CVs).
+    
+    Same output as run_full_analysis.
+    """
+    
+    try:
+        cv_budget = ParseBudget()
         
-        # Step 6: Export summary
-        export_summary = generate_export_summary(tender_data, candidate_data, matching_data)
+        # Steps 2-6
+        analysis = analyze_candidate(tender_data, cv_text, cv_filename, cv_budget)
+        analysis["partial_parse"] = tender_budget.exceeded or cv_budget.exceeded
+        analysis["parse_warnings"] = tender_budget.warnings("Tender") + cv_budget.warnings("CV")
         
-        # Combine all outputs
         return {
             "status": "success",
-            "analysis": {
-                **tender_data,
-                **candidate_data,
-                **matching_data,
-                "validation_paragraph": validation_paragraph,
-                "rejection_email": rejection_email,
-                **export_summary
-            }
+            "analysis": analysis
         }
     
     except Exception as e:
@@ -0,0 +1,300 @@
+"""
+Versioned binary snapshot of the parsed bench, for warm starts.
+
+A snapshot holds the string vocabulary, every stored CompactProfile, the
+candidate pool's dedup state (upload serials, clusters, MinHash signatures)
+and ranking, the tender, and the open-tender index. A restarted or freshly
+forked worker loads it instead of re-extracting and re-parsing documents.
+
+File layout (integers in the writer's native byte order, which is recorded in
+the header; a reader with another byte order refuses the file):
+
+    8 bytes   MAGIC
+    u32       FORMAT_VERSION
+    u32       header length
+    header    JSON: counts, section table, tender and open tenders
+    padding   to an 8-byte boundary
+    payload   flat sections (arrays of fixed-size integers, or utf-8 blobs),
+              each 8-byte aligned, at the offsets listed in the header
+
+Saving writes a temporary file next to the target, fsyncs it and renames it
+over the target (os.replace), so readers only ever see a whole snapshot.
+
+Loading memory-maps the file read-only. The MinHash signatures stay
+zero-copy views into the mapping, so worker processes loading the same file
+share those pages through the page cache. Per-profile id lists are small and
+are copied into arrays. When the process vocabulary is still empty (a fresh
+worker), snapshot string ids are reused as-is; otherwise they are remapped.
+"""
+
+import json
+import mmap
+import os
+import struct
+import sys
+import tempfile
+import time
+from array import array
+
+import cv_dedup
+import profile_store
+
+MAGIC = b"STSNAP\x00\x00"
+FORMAT_VERSION = 1
+
+_PREAMBLE = struct.Struct("<8sII")
+_ALIGN = 8
+
+# CompactProfile fields holding vocabulary id arrays
+LIST_FIELDS = ("skills", "certifications", "sector_experience", "candidate_skills", "candidate_certifications")
+# CompactProfile fields stored as per-profile strings (candidate_experience_years as its decimal string)
+TEXT_FIELDS = ("filename", "name", "experience_years", "full_name", "candidate_experience_years")
+
+
+class SnapshotError(Exception):
+    pass
+
+
+class _Payload:
+    def __init__(self):
+        self.sections = {}
+        self.chunks = []
+        self.size = 0
+
+    def add(self, name, data, typecode="B"):
+        raw = data.tobytes() if isinstance(data, array) else bytes(data)
+        padding = -self.size % _ALIGN
+        if padding:
+            self.chunks.append(b"\x00" * padding)
+            self.size += padding
+        self.sections[name] = [self.size, len(raw), typecode]
+        self.chunks.append(raw)
+        self.size += len(raw)
+
+    def add_strings(self, name, strings):
+        offsets = array("Q", [0])
+        blob = bytearray()
+        for value in strings:
+            blob += value.encode("utf-8")
+            offsets.append(len(blob))
+        self.add(f"{name}_offsets", offsets, "Q")
+        self.add(f"{name}_bytes", blob)
+
+    def add_lists(self, name, lists):
+        offsets = array("I", [0])
+        flat = array("I")
+        for values in lists:
+            flat.extend(values)
+            offsets.append(len(flat))
+        self.add(f"{name}_offsets", offsets, "I")
+        self.add(f"{name}_ids", flat, "I")
+
+
+def save(path, pool, tender_text="", tender_requirements=None, open_tenders=(),
+         vocabulary=profile_store.VOCABULARY):
+    """
+    Atomically write a snapshot of `pool` (a CandidatePool), the tender and
+    the open tenders (TenderIndex.tenders() entries) to `path`.
+    """
+    state = pool.state()
+    serials = sorted(state["profiles"])
+    profiles = [state["profiles"][serial] for serial in serials]
+    uploaded = sorted(state["filenames"])
+    signed = sorted(state["signatures"])
+
+    texts = []
+    for profile in profiles:
+        texts.extend(str(getattr(profile, field)) for field in TEXT_FIELDS)
+    upload_text = len(texts)
+    texts.extend(state["filenames"][serial] for serial in uploaded)
+
+    payload = _Payload()
+    payload.add_strings("vocab", vocabulary.strings())
+    payload.add_strings("text", texts)
+    payload.add("profile_serial", array("I", serials), "I")
+    payload.add("profile_sector", array("I", [p.candidate_sector for p in profiles]), "I")
+    payload.add("profile_partial", array("B", [bool(p.partial_parse) for p in profiles]), "B")
+    for field in LIST_FIELDS:
+        payload.add_lists(field, [getattr(p, field) for p in profiles])
+    payload.add_lists("members", [state["members"][serial] for serial in serials])
+    payload.add("uploaded_serial", array("I", uploaded), "I")
+    signatures = array("I")
+    for serial in signed:
+        signatures.extend(state["signatures"][serial])
+    payload.add("signature_serial", array("I", signed), "I")
+    payload.add("signatures", signatures, "I")
+    payload.add("ranking_serial", array("I", [serial for serial, _ in state["ranking"]]), "I")
+    payload.add("ranking_score", array("i", [score for _, score in state["ranking"]]), "i")
+
+    header = json.dumps({
+        "created_at": time.time(),
+        "byteorder": sys.byteorder,
+        "num_perm": cv_dedup.NUM_PERM,
+        "next_serial": state["next_serial"],
+        "upload_text": upload_text,
+        "sections": payload.sections,
+        "tender_text": tender_text,
+        "tender_requirements": tender_requirements,
+        "open_tenders": list(open_tenders),
+    }).encode("utf-8")
+    payload_start = _PREAMBLE.size + len(header)
+    payload_start += -payload_start % _ALIGN
+
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=".snapshot-", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(_PREAMBLE.pack(MAGIC, FORMAT_VERSION, len(header)))
+            f.write(header)
+            f.write(b"\x00" * (payload_start - f.tell()))
+            for chunk in payload.chunks:
+                f.write(chunk)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+    # Persist the rename itself. Windows cannot open or fsync a directory; the
+    # snapshot is already complete at this point, so this is best effort.
+    if os.name != "nt":
+        try:
+            dir_fd = os.open(directory, os.O_RDONLY)
+            try:
+                os.fsync(dir_fd)
+            finally:
+                os.close(dir_fd)
+        except OSError as e:
+            print(f"Could not fsync snapshot directory {directory}: {e}")
+
+    return {"path": path, "bytes": payload_start + payload.size, "profiles": len(profiles), "uploaded": len(uploaded)}
+
+
+class Snapshot:
+    """
+    A loaded snapshot. `pool_state` is the keyword arguments of
+    CandidatePool.restore (without the scorer). Signatures are views into
+    `mapping`, which stays open as long as they are referenced.
+    """
+
+    def __init__(self, header, pool_state, mapping):
+        self.created_at = header["created_at"]
+        self.tender_text = header["tender_text"]
+        self.tender_requirements = header["tender_requirements"]
+        self.open_tenders = header["open_tenders"]
+        self.pool_state = pool_state
+        self.mapping = mapping
+
+
+def load(path, vocabulary=profile_store.VOCABULARY):
+    """
+    Load a snapshot. A file that is not a snapshot, comes from an
+    incompatible build, or is truncated or corrupt raises SnapshotError.
+    """
+    try:
+        with open(path, "rb") as f:
+            mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return _decode(path, mapping, vocabulary)
+    except SnapshotError:
+        raise
+    except (ValueError, TypeError, IndexError, KeyError, struct.error) as e:
+        # Malformed header or sections (UnicodeDecodeError and JSONDecodeError are ValueErrors)
+        raise SnapshotError(f"{path} is corrupt: {type(e).__name__}: {e}") from e
+
+
+def _decode(path, mapping, vocabulary):
+    if len(mapping) < _PREAMBLE.size:
+        raise SnapshotError(f"{path} is not a snapshot")
+    magic, version, header_length = _PREAMBLE.unpack_from(mapping)
+    if magic != MAGIC:
+        raise SnapshotError(f"{path} is not a snapshot")
+    if version != FORMAT_VERSION:
+        raise SnapshotError(f"{path} has format version {version}, expected {FORMAT_VERSION}")
+    header = json.loads(mapping[_PREAMBLE.size:_PREAMBLE.size + header_length])
+    if header["byteorder"] != sys.byteorder or header["num_perm"] != cv_dedup.NUM_PERM:
+        raise SnapshotError(f"{path} was written by an incompatible build")
+
+    payload_start = _PREAMBLE.size + header_length
+    payload_start += -payload_start % _ALIGN
+    view = memoryview(mapping)
+    sections = header["sections"]
+    for name, (offset, length, typecode) in sections.items():
+        if offset < 0 or length % array(typecode).itemsize or payload_start + offset + length > len(mapping):
+            raise SnapshotError(f"{path} is truncated or corrupt (section {name})")
+
+    def section(name, raw=False):
+        offset, length, typecode = sections[name]
+        start = payload_start + offset
+        data = view[start:start + length]
+        return data if raw else data.cast(typecode)
+
+    def strings(name):
+        offsets, blob = section(f"{name}_offsets"), section(f"{name}_bytes")
+        raw = bytes(blob)
+        return [raw[offsets[i]:offsets[i + 1]].decode("utf-8") for i in range(len(offsets) - 1)]
+
+    # Vocabulary: reuse the snapshot's ids when the process vocabulary matches its prefix
+    vocab_strings = strings("vocab")
+    remap = [vocabulary.intern(value) for value in vocab_strings]
+    identity = all(new_id == old_id for old_id, new_id in enumerate(remap))
+
+    def lists(name, vocabulary_ids=True):
+        offsets = section(f"{name}_offsets")
+        if identity or not vocabulary_ids:
+            raw, size = section(f"{name}_ids", raw=True), array("I").itemsize
+            result = []
+            for i in range(len(offsets) - 1):
+                values = array("I")
+                values.frombytes(raw[offsets[i] * size:offsets[i + 1] * size])
+                result.append(values)
+            return result
+        ids = array("I", [remap[i] for i in section(f"{name}_ids")])
+        return [ids[offsets[i]:offsets[i + 1]] for i in range(len(offsets) - 1)]
+
+    texts = strings("text")
+    serials = section("profile_serial").tolist()
+    sectors = section("profile_sector")
+    partial = section("profile_partial")
+    field_lists = {field: lists(field) for field in LIST_FIELDS}
+    members = lists("members", vocabulary_ids=False)
+
+    profiles = {}
+    per_profile = len(TEXT_FIELDS)
+    for i, serial in enumerate(serials):
+        profile = profile_store.CompactProfile()
+        filename, name, experience_years, full_name, candidate_years = texts[i * per_profile:(i + 1) * per_profile]
+        profile.filename = filename
+        profile.name = name
+        profile.experience_years = sys.intern(experience_years)
+        profile.full_name = full_name
+        profile.candidate_experience_years = int(candidate_years)
+        profile.candidate_sector = remap[sectors[i]]
+        profile.partial_parse = bool(partial[i])
+        for field in LIST_FIELDS:
+            setattr(profile, field, field_lists[field][i])
+        profiles[serial] = profile
+
+    upload_text = header["upload_text"]
+    filenames = dict(zip(section("uploaded_serial").tolist(), texts[upload_text:]))
+    members = {serial: list(values) for serial, values in zip(serials, members)}
+    for serial, profile in profiles.items():
+        profile.duplicates = tuple(filenames[m] for m in members[serial][:-1])
+
+    signature_view = section("signatures")
+    width = cv_dedup.NUM_PERM
+    signatures = {serial: signature_view[i * width:(i + 1) * width]
+                  for i, serial in enumerate(section("signature_serial").tolist())}
+    for serial, profile in profiles.items():
+        profile.signature = signatures.get(serial)
+
+    ranking = list(zip(section("ranking_serial").tolist(), section("ranking_score").tolist()))
+
+    return Snapshot(header, {
+        "next_serial": header["next_serial"],
+        "filenames": filenames,
+        "signatures": signatures,
+        "members": members,
+        "profiles": profiles,
+        "ranking": ranking,
+    }, mapping)
@@ -0,0 +1,304 @@
+"""
+Team composition: the smallest (or cheapest) set of consultants whose combined
+skills and certifications cover a tender's whole requirement list.
+
+Requirements are numbered and every consultant becomes an int bitmask of the
+requirements they cover (same lowercase "one contains the other" rule as
+app.generate_matching_explanation), so coverage tests are single AND/OR
+operations. Before searching:
+
+- consultants covering nothing are dropped;
+- consultants with identical masks collapse onto the cheapest one;
+- a consultant is dropped when another covers a superset of their
+  requirements at no higher cost (dominance pruning).
+
+Pruned consultants are not lost as alternatives: every team member lists the
+consultants of the whole bench who could take their place in that team at no
+higher cost ("substitutes").
+
+A greedy set cover (best newly covered requirements per unit of cost) gives a
+first team immediately. A branch-and-bound search then enumerates covers,
+branching on the uncovered requirement with the fewest candidates and keeping
+the `max_teams` best distinct teams. Subtrees that cannot beat the worst kept
+team are cut. On small and medium benches the search finishes and the first
+team is proven optimal. On large ones it stops at `time_limit` and returns
+the best teams found so far, flagged `optimal: False`.
+
+Costs are optional: without them every consultant costs 1 and the objective
+is team size.
+"""
+
+import heapq
+import math
+import os
+import time
+
+DEFAULT_TIME_LIMIT = float(os.environ.get("TEAM_BUILDER_TIME_LIMIT", "2.0"))
+DEFAULT_MAX_TEAMS = 5
+MAX_SUBSTITUTES = 5
+
+# Nodes explored between two clock reads
+_CHECK_EVERY = 256
+
+
+class _Timeout(Exception):
+    pass
+
+
+def _bits(value):
+    """Indexes of the set bits of a non-negative int, lowest first."""
+    while value:
+        low = value & -value
+        yield low.bit_length() - 1
+        value ^= low
+
+
+def _matches(required, offered):
+    return required in offered or offered in required
+
+
+def encode(requirements, consultants):
+    """
+    Requirement bitmask of each consultant.
+
+    `requirements` is a list of (kind, label) pairs, e.g. ("skill", "Python");
+    each consultant dict maps the same kinds to lists of strings. Masks are
+    cached per (kind, string) since benches share most of their vocabulary.
+    """
+    by_kind = {}
+    for bit, (kind, label) in enumerate(requirements):
+        by_kind.setdefault(kind, []).append((bit, label.strip().lower()))
+
+    cache = {}
+    masks = []
+    for consultant in consultants:
+        mask = 0
+        for kind, required in by_kind.items():
+            for offered in consultant.get(kind) or ():
+                key = (kind, offered)
+                if key not in cache:
+                    value = offered.strip().lower()
+                    cache[key] = sum(1 << bit for bit, label in required if value and _matches(label, value))
+                mask |= cache[key]
+        masks.append(mask)
+    return masks
+
+
+def prune(masks, costs):
+    """Indexes of the non-dominated consultants, the only ones searched."""
+    by_mask = {}
+    for i, mask in enumerate(masks):
+        if mask and (mask not in by_mask or (costs[i], i) < (costs[by_mask[mask]], by_mask[mask])):
+            by_mask[mask] = i
+    representatives = list(by_mask.values())
+
+    # Wider, cheaper consultants first, so a dominating one is always kept before
+    representatives.sort(key=lambda i: (-masks[i].bit_count(), costs[i], i))
+    kept = []
+    for i in representatives:
+        if not any(masks[k] | masks[i] == masks[k] and costs[k] <= costs[i] for k in kept):
+            kept.append(i)
+    kept.sort()
+    return kept
+
+
+def substitutes(members, masks, costs, target, limit=MAX_SUBSTITUTES):
+    """
+    For each member of a team (indexes into `masks`), the other consultants
+    who cover everything only that member brings, at no higher cost.
+    """
+    result = []
+    for member in members:
+        others = 0
+        for o in members:
+            if o != member:
+                others |= masks[o]
+        needed = target & ~others
+        found = sorted((i for i, mask in enumerate(masks)
+                        if i not in members and mask & needed == needed and costs[i] <= costs[member]),
+                       key=lambda i: (costs[i], i))
+        result.append(found[:limit])
+    return result
+
+
+class _Search:
+    def __init__(self, masks, costs, target, max_teams, deadline):
+        self.masks = masks
+        self.costs = costs
+        self.target = target
+        self.max_teams = max_teams
+        self.deadline = deadline
+        self.nodes = 0
+        self.kept = []     # heap of (-cost, -size, -order, members): worst kept team on top
+        self.seen = set()
+        self._order = 0
+
+        # Per requirement: int bitset of the entries covering it, and the
+        # entries sorted by cost (for the lower bound).
+        self.coverers = {}
+        self.by_cost = {}
+        for bit in _bits(target):
+            entries = [e for e, mask in enumerate(masks) if mask >> bit & 1]
+            self.coverers[bit] = sum(1 << e for e in entries)
+            self.by_cost[bit] = sorted(entries, key=lambda e: costs[e])
+        self.widest = max((mask.bit_count() for mask in masks), default=1)
+        self.cheapest = min(costs, default=0.0)
+
+    def full(self):
+        return len(self.kept) >= self.max_teams
+
+    def worst_cost(self):
+        return -self.kept[0][0]
+
+    def record(self, members):
+        # Drop members made redundant by later picks, most expensive first
+        members = sorted(members, key=lambda e: (-self.costs[e], e))
+        for e in list(members):
+            others = 0
+            for o in members:
+                if o != e:
+                    others |= self.masks[o]
+            if others & self.target == self.target:
+                members.remove(e)
+        members = tuple(sorted(members))
+        if members in self.seen:
+            return
+        cost = sum(self.costs[e] for e in members)
+        if self.full() and (cost, len(members)) >= (self.worst_cost(), -self.kept[0][1]):
+            return
+        self.seen.add(members)
+        self._order += 1
+        heapq.heappush(self.kept, (-cost, -len(members), -self._order, members))
+        if len(self.kept) > self.max_teams:
+            heapq.heappop(self.kept)
+
+    def greedy(self):
+        covered, members, available = 0, [], set(range(len(self.masks)))
+        while covered != self.target:
+            best, best_key = None, None
+            for e in available:
+                gain = (self.masks[e] & ~covered).bit_count()
+                if gain:
+                    key = (-gain / self.costs[e] if self.costs[e] > 0 else -math.inf, self.costs[e], e)
+                    if best_key is None or key < best_key:
+                        best, best_key = e, key
+            members.append(best)
+            available.discard(best)
+            covered |= self.masks[best]
+        self.record(members)
+
+    def lower_bound(self, remaining, excluded):
+        """Extra cost needed to cover `remaining` without the `excluded` entries (None if impossible)."""
+        # At least ceil(remaining / widest mask) more members...
+        bound = math.ceil(remaining.bit_count() / self.widest) * self.cheapest
+        # ...and at least the cheapest way to cover each single requirement
+        for bit in _bits(remaining):
+            cheapest = next((e for e in self.by_cost[bit] if not excluded >> e & 1), None)
+            if cheapest is None:
+                return None
+            bound = max(bound, self.costs[cheapest])
+        return bound
+
+    def branch(self, covered, members, cost, excluded):
+        self.nodes += 1
+        if self.nodes % _CHECK_EVERY == 0 and time.monotonic() > self.deadline:
+            raise _Timeout()
+
+        remaining = self.target & ~covered
+        if not remaining:
+            self.record(members)
+            return
+
+        bound = self.lower_bound(remaining, excluded)
+        if bound is None:
+            return
+        if self.full() and cost + bound >= self.worst_cost():
+            return
+
+        # Branch on the uncovered requirement with the fewest available candidates
+        bit = min(_bits(remaining), key=lambda b: ((self.coverers[b] & ~excluded).bit_count(), b))
+        options = sorted(_bits(self.coverers[bit] & ~excluded),
+                         key=lambda e: (self.costs[e], -(self.masks[e] & remaining).bit_count(), e))
+        for e in options:
+            # Each subtree excludes the options tried before it, so no team is built twice
+            self.branch(covered | self.masks[e], members + [e], cost + self.costs[e], excluded)
+            excluded |= 1 << e
+
+    def teams(self):
+        return [members for _, _, _, members in sorted(self.kept, reverse=True)]
+
+
+def build_teams(requirements, consultants, max_teams=DEFAULT_MAX_TEAMS, time_limit=DEFAULT_TIME_LIMIT):
+    """
+    Find up to `max_teams` alternative teams covering `requirements`.
+
+    Input:
+    - requirements: list of (kind, label) pairs, e.g. [("skill", "Python"), ("certification", "PMP")]
+    - consultants: list of dicts with an "id", one list of strings per
+      requirement kind, and an optional "cost" (default 1)
+
+    Output:
+    {
+      "teams": [{"members": [{"id", "cost", "covers", "substitutes"}], "size", "cost"}],
+      "uncoverable": [labels nobody covers],
+      "optimal": bool,           # search finished: teams[0] is a minimum-cost team
+      "consultants_considered": int,
+      "consultants_after_pruning": int,
+      "nodes_explored": int,
+      "elapsed_ms": float
+    }
+
+    Requirements nobody covers are reported in "uncoverable" and the teams
+    cover everything else.
+    """
+    if not (time_limit >= 0 and math.isfinite(time_limit)):
+        # A NaN deadline compares false forever: the search would never stop
+        raise ValueError(f"time_limit must be a finite number of seconds, got {time_limit!r}")
+    started = time.monotonic()
+    all_masks = encode(requirements, consultants)
+    all_costs = [float(c.get("cost", 1) if c.get("cost") is not None else 1) for c in consultants]
+
+    coverable = 0
+    for mask in all_masks:
+        coverable |= mask
+    full = (1 << len(requirements)) - 1
+    uncoverable = [requirements[bit][1] for bit in _bits(full & ~coverable)]
+
+    kept = prune(all_masks, all_costs)
+    search = _Search([all_masks[i] for i in kept], [all_costs[i] for i in kept],
+                     coverable, max_teams, started + time_limit)
+
+    optimal = True
+    if coverable:
+        search.greedy()
+        try:
+            search.branch(0, [], 0.0, 0)
+        except _Timeout:
+            optimal = False
+        teams = search.teams()
+    else:
+        teams = []
+
+    def describe(members):
+        members = [kept[e] for e in members]
+        alternatives = substitutes(members, all_masks, all_costs, coverable)
+        return {
+            "members": [{
+                "id": consultants[i]["id"],
+                "cost": all_costs[i],
+                "covers": [requirements[bit][1] for bit in _bits(all_masks[i])],
+                "substitutes": [consultants[s]["id"] for s in subs]
+            } for i, subs in zip(members, alternatives)],
+            "size": len(members),
+            "cost": sum(all_costs[i] for i in members)
+        }
+
+    return {
+        "teams": [describe(members) for members in teams],
+        "uncoverable": uncoverable,
+        "optimal": optimal,
+        "consultants_considered": len(consultants),
+        "consultants_after_pruning": len(kept),
+        "nodes_explored": search.nodes,
+        "elapsed_ms": round((time.monotonic() - started) * 1000, 2)
+    }
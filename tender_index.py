@@ -0,0 +1,163 @@
+"""
+Reverse matching: which open tenders does one consultant fit?
+
+TenderIndex keeps the requirements of every open tender (the "tender" dict
+from smarttender_service.extract_tender_requirements) in inverted indexes
+keyed by normalized skill and certification. A query with one candidate (the
+"candidate" dict from extract_cv_data) only touches the tenders sharing at
+least one skill with it, so it stays in the millisecond range with hundreds
+of open tenders.
+
+Matching follows smarttender_service.analyze_matching: a skill or
+certification matches when one lowercased string equals or contains the
+other; a tender is eligible when the experience requirement is met (or not
+specified) and, if it requires certifications, at least one is matched.
+"""
+
+import functools
+import threading
+
+# Distinct query terms whose substring lookups are remembered, per term index
+MATCH_CACHE_SIZE = 4096
+
+
+def _normalize(value):
+    return value.strip().lower()
+
+
+class _TermIndex:
+    """Postings from normalized term to tender ids, with substring lookups cached per query term."""
+
+    def __init__(self):
+        self.postings = {}
+        self._match_cache = functools.lru_cache(maxsize=MATCH_CACHE_SIZE)(self._scan)
+
+    def add(self, term, tender_id):
+        if term not in self.postings:
+            self.postings[term] = set()
+            self._match_cache.cache_clear()
+        self.postings[term].add(tender_id)
+
+    def discard(self, term, tender_id):
+        ids = self.postings.get(term)
+        if ids is None:
+            return
+        ids.discard(tender_id)
+        if not ids:
+            del self.postings[term]
+            self._match_cache.cache_clear()
+
+    def matching_terms(self, query):
+        """Indexed terms equal to, contained in, or containing `query`."""
+        return self._match_cache(query)
+
+    def _scan(self, query):
+        return [t for t in self.postings if t == query or t in query or query in t]
+
+
+class TenderIndex:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._tenders = {}          # tender_id -> {"tender": ..., "title": ...}
+        self._skills = _TermIndex()
+        self._certs = _TermIndex()
+        self._no_skills = set()     # tenders without required skills
+
+    def __len__(self):
+        return len(self._tenders)
+
+    def __contains__(self, tender_id):
+        return tender_id in self._tenders
+
+    def add(self, tender_id, tender, title=None):
+        """Add or replace an open tender."""
+        with self._lock:
+            if tender_id in self._tenders:
+                self._remove(tender_id)
+            self._tenders[tender_id] = {"tender": tender, "title": title or tender_id}
+            skills = {_normalize(s) for s in tender["required_skills"] if s.strip()}
+            for skill in skills:
+                self._skills.add(skill, tender_id)
+            if not skills:
+                self._no_skills.add(tender_id)
+            for cert in {_normalize(c) for c in tender["required_certifications"] if c.strip()}:
+                self._certs.add(cert, tender_id)
+
+    def remove(self, tender_id):
+        """Close a tender. Returns False if it was not open."""
+        with self._lock:
+            if tender_id not in self._tenders:
+                return False
+            self._remove(tender_id)
+            return True
+
+    def _remove(self, tender_id):
+        tender = self._tenders.pop(tender_id)["tender"]
+        for skill in tender["required_skills"]:
+            self._skills.discard(_normalize(skill), tender_id)
+        for cert in tender["required_certifications"]:
+            self._certs.discard(_normalize(cert), tender_id)
+        self._no_skills.discard(tender_id)
+
+    def tenders(self):
+        with self._lock:
+            return [{"tender_id": tender_id, "title": entry["title"], **entry["tender"]}
+                    for tender_id, entry in self._tenders.items()]
+
+    def match(self, candidate, limit=20, min_coverage=0.0):
+        """
+        Rank the open tenders a candidate is eligible for.
+
+        Tenders are ordered by share of required skills covered, then sector
+        match, then id. Returns at most `limit` entries.
+        """
+        skills = {_normalize(s) for s in candidate["skills"] if s.strip()}
+        certs = {_normalize(c) for c in candidate["certifications"] if c.strip()}
+        sector = candidate["sector"].lower() if candidate["sector"] != "Not specified" else ""
+        years = candidate["experience_years"]
+
+        with self._lock:
+            covered = {}  # tender_id -> set of normalized required skills covered
+            for skill in skills:
+                for term in self._skills.matching_terms(skill):
+                    for tender_id in self._skills.postings[term]:
+                        covered.setdefault(tender_id, set()).add(term)
+            for tender_id in self._no_skills:
+                covered.setdefault(tender_id, set())
+
+            cert_hits = set()
+            for cert in certs:
+                for term in self._certs.matching_terms(cert):
+                    cert_hits.update(self._certs.postings[term])
+
+            results = []
+            for tender_id, terms in covered.items():
+                tender = self._tenders[tender_id]["tender"]
+                required = tender["required_skills"]
+                coverage = len(terms) / len({_normalize(s) for s in required}) if required else 1.0
+                if coverage < min_coverage:
+                    continue
+
+                required_years = tender["minimum_experience_years"]
+                if required_years > 0 and years < required_years:
+                    continue
+                if tender["required_certifications"] and tender_id not in cert_hits:
+                    continue
+
+                tender_sector = tender["sector"].lower() if tender["sector"] != "Not specified" else ""
+                sector_match = "Yes" if (sector and tender_sector and sector == tender_sector) else "No"
+                missing = [s for s in required if _normalize(s) not in terms]
+                results.append({
+                    "tender_id": tender_id,
+                    "title": self._tenders[tender_id]["title"],
+                    "role": tender["role"],
+                    "coverage": round(coverage, 3),
+                    "matched_skills": [s for s in required if _normalize(s) in terms],
+                    "missing_skills": missing,
+                    "experience_match": "Yes" if required_years > 0 else "Not specified",
+                    "sector_match": sector_match,
+                    "suitable": not missing,
+                })
+
+        results.sort(key=lambda r: (-r["coverage"], r["sector_match"] != "Yes", r["tender_id"]))
+        return results[:limit]